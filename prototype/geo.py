@@ -0,0 +1,33 @@
+# 장소 위치 검색 모듈 - v4/geo.py의 격자(grid) 공간 색인과 haversine 거리 계산을 그대로 사용 (복사본을 두지 않아 두 앱의 구현이 어긋나지 않음)
+# 장소 좌표는 시뮬레이션 생성 시 정해지므로 색인은 프로세스당 한 번만 만들고, 혼잡도 조건은 검색할 때 마스크로 넘김
+
+import importlib.util
+import os
+import sys
+
+_V4_GEO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'v4', 'geo.py')
+_MODULE_NAME = 'kusis_v4_geo'
+
+
+def _load_v4_geo():
+    # 이 모듈과 이름(geo)이 같으므로 sys.path가 아니라 파일 경로로 다른 이름을 붙여 불러옴
+    module = sys.modules.get(_MODULE_NAME)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(_MODULE_NAME, _V4_GEO)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[_MODULE_NAME] = module
+    return module
+
+
+_geo = _load_v4_geo()
+EARTH_RADIUS_M = _geo.EARTH_RADIUS_M
+METERS_PER_DEGREE_LAT = _geo.METERS_PER_DEGREE_LAT
+haversine_m = _geo.haversine_m
+
+
+class GridIndex(_geo.GridIndex):
+    """장소용 격자 색인 - 장소가 성수동 일대에 몰려 있어 v4보다 작은 칸(200m)을 씀"""
+
+    def __init__(self, lats, lons, cell_m=200.0):
+        super().__init__(lats, lons, cell_m)
@@ -0,0 +1,379 @@
+# 실시간 혼잡도 수집 - 센서/계수기 값을 소스(파일, UDP 소켓, 큐)에서 받아 짧은 간격으로 모아서 장소별 최신 상태 표에 반영
+# 화면은 최신 상태 표를 잠금 없이 읽어서 시뮬레이션 값 위에 덮어씀 (수집이 꺼져 있으면 시뮬레이션 값 그대로)
+#
+# 설정: 환경 변수 DASHBOARD_INGEST
+#   replay:<경로>       기록된 JSONL 파일을 원래 시간 간격대로 반복 재생 (실제 피드 대신 쓰는 시연/부하 테스트용)
+#   file:<경로>         JSONL 파일 끝에 추가되는 줄을 계속 읽음 (tail -f)
+#   udp:<호스트>:<포트>  UDP 데이터그램 (한 데이터그램에 JSONL 여러 줄 가능)
+# 한 줄 형식: {"ts": 유닉스 시각(생략 시 받은 시각), "spot": "장소 이름", "혼잡도": 320, "화제성": 71, ...}
+#
+# 재생용 파일 만들기: python ingest.py record feed.jsonl --seconds 60 --rate 2000
+
+import abc
+import argparse
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from simulation import DEMO_SPOTS, METRICS, open_simulation
+
+INGEST_ENV = 'DASHBOARD_INGEST'
+REPLAY_SPEED_ENV = 'DASHBOARD_INGEST_SPEED'
+# 한 번에 표에 반영할 최대 건수와 최대 대기 시간(초)
+BATCH_SIZE = 5000
+BATCH_INTERVAL = 0.2
+# 이 시간(초)보다 오래된 실측값은 화면에서 쓰지 않고 시뮬레이션 값으로 되돌림
+STALE_SECONDS = 300
+
+
+def parse_reading(line, received_at=None):
+    """JSON 한 줄을 읽어 dict로 반환 (장소 이름이 없으면 ValueError)"""
+    reading = json.loads(line) if isinstance(line, (str, bytes)) else dict(line)
+    if not reading.get('spot'):
+        raise ValueError("spot이 없는 측정값입니다.")
+    reading['ts'] = float(reading['ts']) if reading.get('ts') is not None else (received_at or time.time())
+    for metric in METRICS:
+        if reading.get(metric) is not None:
+            reading[metric] = float(reading[metric])
+    return reading
+
+
+class Source(abc.ABC):
+    """측정값 소스 공통 인터페이스 - read()는 최대 max_items개를 timeout초 안에 돌려줌 (없으면 빈 목록)"""
+
+    errors = 0
+
+    @abc.abstractmethod
+    def read(self, max_items, timeout):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def _parse_lines(self, lines, received_at=None):
+        readings = []
+        for line in lines:
+            if isinstance(line, (str, bytes)) and not line.strip():
+                continue
+            try:
+                readings.append(parse_reading(line, received_at))
+            except (ValueError, TypeError, KeyError):
+                self.errors += 1
+        return readings
+
+
+class QueueSource(Source):
+    """같은 프로세스 안의 queue.Queue에서 측정값(dict 또는 JSON 문자열)을 읽음"""
+
+    def __init__(self, q=None):
+        self.queue = q or queue.Queue()
+
+    def read(self, max_items, timeout):
+        try:
+            items = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(items) < max_items:
+            try:
+                items.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return self._parse_lines(items, time.time())
+
+
+class FileSource(Source):
+    """JSONL 파일 끝에 새로 추가되는 줄을 읽음 (from_start면 처음부터)"""
+
+    def __init__(self, path, from_start=False):
+        self.path = path
+        self._file = open(path, 'r', encoding='utf-8')
+        if not from_start:
+            self._file.seek(0, os.SEEK_END)
+        self._partial = ''
+
+    def read(self, max_items, timeout):
+        deadline = time.monotonic() + timeout
+        lines = []
+        while len(lines) < max_items:
+            line = self._file.readline()
+            if not line:
+                if lines or time.monotonic() >= deadline:
+                    break
+                time.sleep(min(0.05, timeout))
+                continue
+            # 쓰는 중인 마지막 줄은 줄바꿈이 올 때까지 모아 둠
+            self._partial += line
+            if self._partial.endswith('\n'):
+                lines.append(self._partial)
+                self._partial = ''
+        return self._parse_lines(lines, time.time())
+
+    def close(self):
+        self._file.close()
+
+
+class ReplayFileSource(Source):
+    """기록된 JSONL 파일을 원래 시간 간격(speed배)대로 재생하고, 끝나면 처음부터 반복 (시각은 재생 시점 기준으로 바꿈)"""
+
+    def __init__(self, path, speed=1.0, loop=True):
+        with open(path, encoding='utf-8') as f:
+            readings = self._parse_lines(f)
+        if not readings:
+            raise ValueError(f"재생할 측정값이 없습니다: {path}")
+        readings.sort(key=lambda r: r['ts'])
+        first = readings[0]['ts']
+        self._offsets = np.array([r['ts'] - first for r in readings]) / speed
+        self._readings = readings
+        self._duration = self._offsets[-1] + 1.0 / speed
+        self._loop = loop
+        self._started = time.time()
+        self._position = 0
+
+    def read(self, max_items, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            elapsed = time.time() - self._started
+            if self._position >= len(self._readings):
+                if not self._loop:
+                    time.sleep(timeout)
+                    return []
+                self._started += self._duration
+                self._position = 0
+                continue
+            # 지금까지 재생 시각이 된 측정값을 한 번에 꺼냄 (위치는 이진 탐색)
+            end = min(int(np.searchsorted(self._offsets, elapsed, side='right')), self._position + max_items)
+            if end > self._position:
+                batch = []
+                for offset, reading in zip(self._offsets[self._position:end], self._readings[self._position:end]):
+                    reading = dict(reading)
+                    reading['ts'] = self._started + offset
+                    batch.append(reading)
+                self._position = end
+                return batch
+            wait = min(deadline - time.monotonic(), self._offsets[self._position] - elapsed)
+            if wait <= 0:
+                return []
+            time.sleep(wait)
+
+
+class UDPSource(Source):
+    """UDP 데이터그램으로 들어오는 JSONL 측정값을 읽음"""
+
+    def __init__(self, host, port):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 2**20)
+        self._sock.bind((host, port))
+
+    def read(self, max_items, timeout):
+        deadline = time.monotonic() + timeout
+        lines = []
+        while len(lines) < max_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._sock.settimeout(remaining if not lines else 0.001)
+            try:
+                data, _ = self._sock.recvfrom(65536)
+            except (socket.timeout, BlockingIOError):
+                break
+            lines.extend(data.decode('utf-8', errors='replace').splitlines())
+        return self._parse_lines(lines, time.time())
+
+    def close(self):
+        self._sock.close()
+
+
+class LatestStateTable:
+    """장소별 최신 측정값을 지표마다 NumPy 배열 하나로 보관하는 표
+    반영할 때마다 새 배열을 만들어 참조만 바꾸므로, 화면은 잠금 없이 항상 완성된 상태를 읽음"""
+
+    def __init__(self, spots, metrics=METRICS):
+        self.spots = list(spots)
+        self.metrics = tuple(metrics)
+        self._index = pd.Index(self.spots)
+        self._lock = threading.Lock()
+        n = len(self.spots)
+        # (버전, 지표별 값, 지표별 측정 시각) - 값이 없으면 NaN / -inf
+        self._state = (0, {m: np.full(n, np.nan) for m in self.metrics}, {m: np.full(n, -np.inf) for m in self.metrics})
+        self.unknown = 0
+
+    @property
+    def version(self):
+        return self._state[0]
+
+    def apply(self, readings):
+        """측정값 묶음을 반영 (같은 장소는 지표마다 가장 늦은 시각의 값만 남김)하고 반영한 건수를 반환"""
+        if not readings:
+            return 0
+        positions = self._index.get_indexer([r['spot'] for r in readings])
+        known = positions >= 0
+        ts = np.fromiter((r['ts'] for r in readings), dtype='float64', count=len(readings))[known]
+        columns = {m: np.array([r.get(m, np.nan) for r in readings], dtype='float64')[known] for m in self.metrics}
+        positions = positions[known]
+        # 장소, 시각 순으로 정렬해 두면 장소마다 마지막 위치가 가장 늦은 값
+        order = np.lexsort((ts, positions))
+        positions, ts = positions[order], ts[order]
+
+        with self._lock:
+            version, values, updated = self._state
+            values = {m: v.copy() for m, v in values.items()}
+            updated = {m: u.copy() for m, u in updated.items()}
+            for m in self.metrics:
+                v = columns[m][order]
+                ok = ~np.isnan(v)
+                p, t, v = positions[ok], ts[ok], v[ok]
+                last = np.ones(len(p), dtype=bool)
+                last[:-1] = p[1:] != p[:-1]
+                p, t, v = p[last], t[last], v[last]
+                newer = t >= updated[m][p]
+                values[m][p[newer]] = v[newer]
+                updated[m][p[newer]] = t[newer]
+            self.unknown += int((~known).sum())
+            self._state = (version + 1, values, updated)
+        return int(known.sum())
+
+    def frame(self):
+        """현재 최신 상태를 DataFrame으로 (spot, 지표별 값, last_update)"""
+        _, values, updated = self._state
+        frame = pd.DataFrame({'spot': self.spots, **values})
+        frame['last_update'] = np.max(np.vstack([updated[m] for m in self.metrics]), axis=0)
+        return frame
+
+    def overlay(self, df, max_age=STALE_SECONDS, now=None):
+        """df(시뮬레이션 값)의 지표를 최근 max_age초 안에 들어온 실측값으로 바꾼 새 DataFrame을 반환"""
+        _, values, updated = self._state
+        now = now or time.time()
+        positions = self._index.get_indexer(df['spot'])
+        known = positions >= 0
+        df = df.copy()
+        for m in self.metrics:
+            if m not in df.columns:
+                continue
+            live = np.where(known, values[m][positions], np.nan)
+            fresh = known & (now - np.where(known, updated[m][positions], -np.inf) <= max_age) & ~np.isnan(live)
+            if fresh.any():
+                df[m] = np.where(fresh, np.rint(live), df[m]).astype(df[m].dtype)
+        return df
+
+
+class IngestPipeline:
+    """소스에서 읽은 측정값을 최대 batch_size개 또는 interval초 단위로 묶어 최신 상태 표에 반영하는 백그라운드 스레드"""
+
+    def __init__(self, source, table, batch_size=BATCH_SIZE, interval=BATCH_INTERVAL):
+        self.source = source
+        self.table = table
+        self.batch_size = batch_size
+        self.interval = interval
+        self.stats = {'received': 0, 'applied': 0, 'batches': 0, 'failed': 0, 'rate': 0.0, 'last_batch_at': None}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='ingest', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._thread.join(timeout)
+        self.source.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            batch = []
+            try:
+                # interval 동안 모으되, batch_size가 차면 바로 반영
+                while len(batch) < self.batch_size and not self._stop.is_set():
+                    remaining = self.interval - (time.monotonic() - started)
+                    if remaining <= 0:
+                        break
+                    batch.extend(self.source.read(self.batch_size - len(batch), remaining))
+                if not batch:
+                    continue
+                applied = self.table.apply(batch)
+            except Exception:
+                # 소스나 표 반영에서 오류가 나도 수집 스레드는 계속 동작하도록 실패 개수만 기록
+                self.stats['failed'] += len(batch) or 1
+                time.sleep(self.interval)
+                continue
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.stats['received'] += len(batch)
+            self.stats['applied'] += applied
+            self.stats['batches'] += 1
+            self.stats['last_batch_at'] = time.time()
+            # 초당 처리량은 지수 이동 평균으로 표시
+            self.stats['rate'] = 0.8 * self.stats['rate'] + 0.2 * len(batch) / elapsed
+
+    @property
+    def errors(self):
+        return self.source.errors
+
+
+def open_source(spec, speed=1.0):
+    """'replay:경로', 'file:경로', 'udp:호스트:포트' 형식의 설정으로 소스를 여는 함수"""
+    kind, _, target = spec.partition(':')
+    if kind == 'replay':
+        return ReplayFileSource(target, speed=speed)
+    if kind == 'file':
+        return FileSource(target)
+    if kind == 'udp':
+        host, _, port = target.rpartition(':')
+        return UDPSource(host or '0.0.0.0', int(port))
+    raise ValueError(f"알 수 없는 수집 소스입니다: {spec}")
+
+
+def open_ingest(spots):
+    """환경 변수에 수집 소스가 설정되어 있으면 파이프라인을 시작해서 반환 (없으면 None)"""
+    spec = os.environ.get(INGEST_ENV)
+    if not spec:
+        return None
+    source = open_source(spec, float(os.environ.get(REPLAY_SPEED_ENV) or 1.0))
+    return IngestPipeline(source, LatestStateTable(spots)).start()
+
+
+def record_feed(path, seconds, rate, seed=0):
+    """시뮬레이션 값에 잡음을 섞은 측정값을 초당 rate건씩 seconds초 분량 JSONL로 기록하고 건수를 반환"""
+    simulation = open_simulation(DEMO_SPOTS)
+    rng = np.random.default_rng(seed)
+    count = int(seconds * rate)
+    start = time.time()
+    ts = start + np.arange(count) / rate
+    spot = rng.integers(0, len(simulation), count)
+    snapshot = simulation.snapshot()
+    crowd = np.maximum(0, np.rint(snapshot['혼잡도'].to_numpy()[spot] * rng.normal(1.0, 0.1, count))).astype(int)
+    # 계수기는 혼잡도만, 가끔 화제성 집계도 함께 보냄
+    with_pop = rng.random(count) < 0.1
+    popularity = snapshot['화제성'].to_numpy()[spot]
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            reading = {'ts': round(float(ts[i]), 3), 'spot': simulation.spots[spot[i]], '혼잡도': int(crowd[i])}
+            if with_pop[i]:
+                reading['화제성'] = int(popularity[i])
+            f.write(json.dumps(reading, ensure_ascii=False) + '\n')
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="혼잡도 수집 도구 - 재생용 측정값 파일을 만듭니다.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    record = sub.add_parser('record', help="시뮬레이션 기반 합성 측정값을 JSONL로 기록")
+    record.add_argument('output')
+    record.add_argument('--seconds', type=float, default=60.0)
+    record.add_argument('--rate', type=float, default=1000.0, help="초당 측정값 수")
+    record.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    count = record_feed(args.output, args.seconds, args.rate, args.seed)
+    print(f"✅ {args.output}: {count}건 기록 ({args.seconds:g}초, 초당 {args.rate:g}건)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+# 현장 보고 저장소 - 모든 세션(역할)이 같은 보고 목록을 보도록 프로세스당 하나만 두는 고정 크기 링 버퍼
+# 환경 변수로 SQLite 파일을 지정하면 보고를 함께 기록하고, 재시작 시 최근 보고를 다시 불러옴
+
+import html
+import os
+import sqlite3
+import threading
+from collections import deque, namedtuple
+from datetime import datetime
+from heapq import merge
+from itertools import islice
+
+# 보고 한 건 - 역할마다 입력 항목이 달라서 해당하지 않는 필드는 None
+REPORT_FIELDS = ('id', 'timestamp', 'role', 'spot', 'severity', 'congestion', 'wait_min', 'capacity', 'comment', 'mood', 'cause', 'road')
+Report = namedtuple('Report', REPORT_FIELDS, defaults=(None,) * 7)
+
+POPUP_ROLE = '팝업운영자'
+GUIDE_ROLE = '이동형 관광안내소'
+
+# 위험도: 팝업운영자는 보고한 혼잡도 수준, 이동형 관광안내소는 분위기/도로 문제 여부로 매김 (클수록 위험)
+SEVERITY_BY_CONGESTION = {'한산': 0, '보통': 1, '혼잡': 2, '매우 혼잡': 3}
+GUIDE_ISSUES = {'불만/짜증', '무질서', '쓰레기 적재', '불법 주정차', '시설물 파손'}
+MAX_SEVERITY = 3
+# 이 위험도 이상이면 "위험도 높은 보고"로 분류 (혼잡도 '매우 혼잡')
+WARNING_SEVERITY = 3
+
+# 메모리에 들고 있을 최근 보고 수 (오래된 보고는 자동으로 밀려남)
+REPORT_CAPACITY = 1000
+# 보고를 SQLite에 남기려면 파일 경로를 지정 (없으면 메모리에만 보관)
+REPORT_DB_ENV = 'DASHBOARD_REPORT_DB'
+
+
+def report_severity(role, congestion=None, mood=None, road=None):
+    """보고 내용으로 위험도(0 ~ MAX_SEVERITY)를 계산"""
+    if role == POPUP_ROLE:
+        return SEVERITY_BY_CONGESTION.get(congestion, 1)
+    return 2 if mood in GUIDE_ISSUES or road in GUIDE_ISSUES else 1
+
+
+def is_warning(report):
+    return report.severity >= WARNING_SEVERITY
+
+
+def format_report(report):
+    """화면 표시용 한 줄 문자열 (사용자 입력은 HTML 이스케이프 - 다른 사람 화면에도 그대로 표시되므로)"""
+    ts = report.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+    if report.role == POPUP_ROLE:
+        text = (f"[{ts}] {report.role} → {report.spot}: 혼잡도 '{report.congestion}', "
+                f"대기 {report.wait_min}분, 입장 가능 {report.capacity}명, 코멘트 '{report.comment}'")
+    else:
+        text = f"[{ts}] {report.role} → {report.spot}: 분위기 '{report.mood}', 원인 '{report.cause}', 도로 상태 '{report.road}'"
+    return html.escape(text, quote=False)
+
+
+class ReportLog:
+    """최근 보고를 시간순으로 보관하는 링 버퍼 (추가 O(1), 여러 세션 스레드에서 동시에 사용 가능)
+    위험도별 deque도 함께 두어서 위험/기타 보고와 위험도 상위 보고를 전체를 훑지 않고 필요한 개수만큼만 읽음"""
+
+    def __init__(self, capacity=REPORT_CAPACITY, db_path=None):
+        self.capacity = capacity
+        self._reports = deque()
+        self._by_severity = [deque() for _ in range(MAX_SEVERITY + 1)]
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._conn = None
+        if db_path:
+            # Streamlit 세션은 서로 다른 스레드에서 실행되므로 연결을 공유하고 락으로 보호
+            self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._create_table()
+            self._load_recent()
+
+    def _create_table(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS reports (
+                    id INTEGER PRIMARY KEY,
+                    timestamp TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    spot TEXT NOT NULL,
+                    severity INTEGER,
+                    congestion TEXT,
+                    wait_min INTEGER,
+                    capacity INTEGER,
+                    comment TEXT,
+                    mood TEXT,
+                    cause TEXT,
+                    road TEXT
+                )
+            """)
+            # 위험도 컬럼이 없던 이전 DB는 컬럼만 추가하고, 값은 불러올 때 계산
+            columns = {row[1] for row in self._conn.execute('PRAGMA table_info(reports)')}
+            if 'severity' not in columns:
+                self._conn.execute('ALTER TABLE reports ADD COLUMN severity INTEGER')
+
+    def _load_recent(self):
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(REPORT_FIELDS)} FROM reports ORDER BY id DESC LIMIT ?", (self.capacity,)
+            ).fetchall()
+            for row in reversed(rows):
+                report = Report(row[0], datetime.fromisoformat(row[1]), *row[2:])
+                if report.severity is None:
+                    report = report._replace(severity=report_severity(report.role, report.congestion, report.mood, report.road))
+                self._push(report)
+            if rows:
+                self._next_id = rows[0][0] + 1
+
+    def _push(self, report):
+        # 가득 차면 가장 오래된 보고를 버림 - 전체에서 가장 오래된 보고는 자기 위험도 deque에서도 가장 오래된 보고
+        if self.capacity and len(self._reports) >= self.capacity:
+            oldest = self._reports.popleft()
+            self._by_severity[oldest.severity].popleft()
+        self._reports.append(report)
+        self._by_severity[report.severity].append(report)
+
+    def append(self, role, spot, **fields):
+        """보고를 추가하고 저장된 Report를 반환 (시각과 번호는 락 안에서 매겨서 항상 시간순이 되도록 함, SQLite 기록 시 번호는 DB가 매김)"""
+        severity = report_severity(role, fields.get('congestion'), fields.get('mood'), fields.get('road'))
+        with self._lock:
+            report = Report(self._next_id, datetime.now(), role, spot, severity, **fields)
+            if self._conn is not None:
+                # 같은 DB 파일을 여러 앱 프로세스가 함께 쓸 수 있으므로 번호는 SQLite가 매기게 함 (프로세스별 카운터는 겹침)
+                with self._conn:
+                    cursor = self._conn.execute(
+                        f"INSERT INTO reports ({', '.join(REPORT_FIELDS[1:])}) VALUES ({', '.join('?' * (len(REPORT_FIELDS) - 1))})",
+                        (report.timestamp.isoformat(), *report[2:])
+                    )
+                report = report._replace(id=cursor.lastrowid)
+            self._push(report)
+            self._next_id = report.id + 1
+        return report
+
+    def latest(self, limit=None):
+        """최근 보고부터 limit개 (없으면 보관 중인 전체)"""
+        with self._lock:
+            return list(islice(reversed(self._reports), limit))
+
+    def _latest_of(self, severities, limit):
+        # 위험도별 deque는 각각 시간순이므로 뒤에서부터 번호 내림차순으로 병합하면 limit개만 읽고 멈춤
+        with self._lock:
+            newest_first = merge(*(reversed(self._by_severity[s]) for s in severities), key=lambda r: r.id, reverse=True)
+            return list(islice(newest_first, limit))
+
+    def warnings(self, limit=None):
+        """위험도 높은 보고를 최근 것부터 limit개"""
+        return self._latest_of(range(WARNING_SEVERITY, MAX_SEVERITY + 1), limit)
+
+    def normal(self, limit=None):
+        """위험도 높은 보고를 제외한 나머지를 최근 것부터 limit개"""
+        return self._latest_of(range(WARNING_SEVERITY), limit)
+
+    def top_risky(self, k=5):
+        """(위험도, 시각) 내림차순 상위 k개 - 위험도가 높은 deque부터 최근 보고를 채움"""
+        top = []
+        with self._lock:
+            for bucket in reversed(self._by_severity):
+                top.extend(islice(reversed(bucket), k - len(top)))
+                if len(top) >= k:
+                    break
+        return top
+
+    def counts(self):
+        """(위험도 높은 보고 수, 기타 보고 수)"""
+        with self._lock:
+            warning = sum(len(self._by_severity[s]) for s in range(WARNING_SEVERITY, MAX_SEVERITY + 1))
+            return warning, len(self._reports) - warning
+
+    @property
+    def version(self):
+        """마지막으로 추가된 보고 번호 (화면 캐시 무효화용)"""
+        return self._next_id - 1
+
+    def __len__(self):
+        return len(self._reports)
+
+
+def open_report_log(capacity=REPORT_CAPACITY):
+    """환경 변수 설정에 따라 메모리 전용 또는 SQLite 기록 보고 저장소를 여는 함수"""
+    return ReportLog(capacity, os.environ.get(REPORT_DB_ENV) or None)
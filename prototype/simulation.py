@@ -0,0 +1,149 @@
+# 혼잡도 시뮬레이션 엔진 - 장소별 혼잡도/화제성/일별 카드 소비액/일별 교통 유입량 시계열을 NumPy로 한 번에 생성
+# 프로세스당 한 번만 만들어 두고, 화면에서는 현재 시각이 속한 시간 슬롯의 값만 꺼내 씀
+# 부하 테스트용으로 환경 변수로 장소 수(합성 장소 추가)와 시간 해상도, 기간을 바꿀 수 있음
+
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+CENTER = (37.544, 127.056)
+# 시연용 장소 목록 (실시간 수집 장소 이름도 이 이름을 씀)
+DEMO_SPOTS = [
+    '팝업스토어 A', '팝업스토어 B', '서울숲 공연장', '연무장길 카페거리', '성수역 부근',
+    '성수동 복합문화공간', '성수 창작소', '거리버스킹 ZONE', '성수동 야시장', '한강진입로 쉼터'
+]
+TAGS_POOL = ['#팝업', '#공연', '#혼잡', '#무질서', '#축제', '#정상']
+METRICS = ('혼잡도', '화제성', '일별_카드_소비액', '일별_교통_유입량')
+
+SIM_DAYS = 7
+SIM_STEP_MINUTES = 10
+SIM_SEED = 42
+SPOTS_ENV = 'DASHBOARD_SIM_SPOTS'
+STEP_ENV = 'DASHBOARD_SIM_STEP_MINUTES'
+DAYS_ENV = 'DASHBOARD_SIM_DAYS'
+
+
+def synthetic_spot_names(count, start=1):
+    """부하 테스트용 합성 장소 이름"""
+    return [f"합성 SPOT {i:05d}" for i in range(start, start + count)]
+
+
+class CongestionSimulation:
+    """장소 × 시간 슬롯 시계열 (혼잡도는 uint16, 화제성은 uint8, 일별 값은 날짜 × 장소로만 저장)"""
+
+    def __init__(self, spots, days=SIM_DAYS, step_minutes=SIM_STEP_MINUTES, seed=SIM_SEED, start=None, synthetic=0):
+        if 1440 % step_minutes:
+            raise ValueError(f"시간 해상도(분)는 1440의 약수여야 합니다: {step_minutes}")
+        rng = np.random.default_rng(seed)
+        n = len(spots)
+        self.spots = list(spots)
+        self.days = days
+        self.step = timedelta(minutes=step_minutes)
+        self.slots_per_day = 1440 // step_minutes
+        self.start = start or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self._index = {spot: i for i, spot in enumerate(self.spots)}
+
+        # 장소별 고정 속성: 원래 시연 데이터와 같은 범위 (뒤쪽 synthetic개의 합성 장소는 더 넓게 흩뿌림)
+        spread = np.where(np.arange(n) < n - synthetic, 0.003, 0.02)
+        self.lat = CENTER[0] + rng.uniform(-1, 1, n) * spread
+        self.lon = CENTER[1] + rng.uniform(-1, 1, n) * spread
+        self.tags = rng.choice(TAGS_POOL, n)
+        base_crowd = rng.integers(50, 701, n).astype('float32')
+        base_pop = rng.integers(30, 101, n).astype('float32')
+        base_card = rng.integers(100000, 2000001, n).astype('float64')
+        base_traffic = rng.integers(30, 301, n).astype('float64')
+
+        # 하루 유동인구 곡선: 장소마다 최고점 시각과 폭이 다른 종 모양 + 새벽 최소치
+        hours = (np.arange(self.slots_per_day) * step_minutes / 60.0).astype('float32')[:, None]
+        peak = rng.uniform(13, 20, n).astype('float32')
+        width = rng.uniform(2.5, 5, n).astype('float32')
+        profile = 0.25 + 0.75 * np.exp(-0.5 * ((hours - peak) / width) ** 2)
+        expected_mean = base_crowd * profile.mean(axis=0)
+
+        # 주말은 더 붐빔, 날마다 장소별로 ±20% 변동, 화제성은 날마다 조금씩 오르내림
+        weekday = np.array([(self.start + timedelta(days=d)).weekday() for d in range(days)])
+        day_factor = rng.uniform(0.8, 1.2, (days, n)).astype('float32') * np.where(weekday >= 5, 1.3, 1.0)[:, None].astype('float32')
+        pop_drift = np.cumsum(rng.normal(0, 4, (days, n)), axis=0).astype('float32')
+
+        # 잡음은 약 30분 이동 평균으로 부드럽게 (누적합으로 계산, 하루 단위로 만들어 최대 메모리를 줄임)
+        window = max(1, 30 // step_minutes)
+        self.crowd = np.empty((days * self.slots_per_day, n), dtype='uint16')
+        self.popularity = np.empty((days * self.slots_per_day, n), dtype='uint8')
+        self.card_daily = np.empty((days, n), dtype='int64')
+        self.traffic_daily = np.empty((days, n), dtype='int32')
+        for d in range(days):
+            white = rng.standard_normal((self.slots_per_day + window, n), dtype='float32')
+            summed = np.cumsum(white, axis=0)
+            smooth = (summed[window:] - summed[:-window]) / np.sqrt(window)
+            crowd = base_crowd * profile * day_factor[d] * np.exp(0.15 * smooth)
+            rows = slice(d * self.slots_per_day, (d + 1) * self.slots_per_day)
+            self.crowd[rows] = np.clip(np.rint(crowd), 0, np.iinfo('uint16').max)
+            self.popularity[rows] = np.clip(np.rint(base_pop + pop_drift[d] + 10 * (profile - 0.5)), 0, 100)
+            # 일별 값은 그날 평균 유동인구가 평소보다 얼마나 많은지에 비례
+            ratio = crowd.mean(axis=0) / expected_mean
+            self.card_daily[d] = np.rint(base_card * ratio)
+            self.traffic_daily[d] = np.rint(base_traffic * ratio)
+
+    def __len__(self):
+        return len(self.spots)
+
+    def position_of(self, spot):
+        """장소의 행 위치 (snapshot()의 행 순서와 같음, 없으면 None)"""
+        return self._index.get(spot)
+
+    @property
+    def nbytes(self):
+        return self.crowd.nbytes + self.popularity.nbytes + self.card_daily.nbytes + self.traffic_daily.nbytes
+
+    def slot_of(self, when=None):
+        """시각이 속한 시간 슬롯 번호 (시뮬레이션 기간을 넘어가면 처음부터 반복)"""
+        offset = (when or datetime.now()) - self.start
+        return int(offset // self.step) % len(self.crowd)
+
+    def snapshot(self, when=None):
+        """현재 시간 슬롯의 장소별 값을 기존 df_time과 같은 컬럼의 DataFrame으로 반환 (호출마다 새로 만듦)"""
+        slot = self.slot_of(when)
+        day = slot // self.slots_per_day
+        return pd.DataFrame({
+            'spot': self.spots,
+            'lat': self.lat,
+            'lon': self.lon,
+            '화제성': self.popularity[slot].astype('int64'),
+            '혼잡도': self.crowd[slot].astype('int64'),
+            '일별_카드_소비액': self.card_daily[day],
+            '일별_교통_유입량': self.traffic_daily[day].astype('int64'),
+            'tag': self.tags,
+        })
+
+    def series(self, spot, metric='혼잡도', when=None):
+        """한 장소의 하루(when이 속한 날) 시계열을 시각 인덱스의 Series로 반환"""
+        i = self._index[spot]
+        when = when or datetime.now()
+        day = self.slot_of(when) // self.slots_per_day
+        rows = slice(day * self.slots_per_day, (day + 1) * self.slots_per_day)
+        if metric == '혼잡도':
+            values = self.crowd[rows, i]
+        elif metric == '화제성':
+            values = self.popularity[rows, i]
+        elif metric == '일별_카드_소비액':
+            values = np.repeat(self.card_daily[day, i], self.slots_per_day)
+        elif metric == '일별_교통_유입량':
+            values = np.repeat(self.traffic_daily[day, i], self.slots_per_day)
+        else:
+            raise KeyError(metric)
+        # 시뮬레이션 기간을 넘어 반복 중이어도 실제 날짜로 표시
+        index = pd.date_range(when.replace(hour=0, minute=0, second=0, microsecond=0), periods=self.slots_per_day, freq=self.step)
+        return pd.Series(values.astype('int64'), index=index, name=metric)
+
+
+def open_simulation(spots):
+    """환경 변수 설정(장소 수, 시간 해상도, 기간)에 따라 시뮬레이션을 생성하는 함수"""
+    synthetic = max(0, int(os.environ.get(SPOTS_ENV) or len(spots)) - len(spots))
+    return CongestionSimulation(
+        list(spots) + synthetic_spot_names(synthetic),
+        days=int(os.environ.get(DAYS_ENV) or SIM_DAYS),
+        step_minutes=int(os.environ.get(STEP_ENV) or SIM_STEP_MINUTES),
+        synthetic=synthetic,
+    )
@@ -1,12 +1,14 @@
 
 # streamlit_app.py
-import pandas as pd
-import numpy as np
-import os
-import random
+import time
 from datetime import datetime
 import plotly.express as px
 import streamlit as st
+
+from reports import GUIDE_ROLE, POPUP_ROLE, format_report, is_warning, open_report_log
+from simulation import DEMO_SPOTS, open_simulation
+from ingest import open_ingest
+from geo import GridIndex, haversine_m
 # ---------------------------
 # 페이지 설정 & 스타일
 # ---------------------------
@@ -53,40 +55,56 @@ with header_col2:
     st.markdown(f"**기준 시간대:** {current_time_str[:13]} (실시간 반영)")
 
 # ---------------------------
-# 임의 데이터 생성
+# 시뮬레이션 데이터 (프로세스당 한 번 생성, 현재 시간 슬롯 값만 사용)
+# 실시간 수집(DASHBOARD_INGEST)이 켜져 있으면 최근 실측값으로 덮어씀
 # ---------------------------
-random.seed(42)
-np.random.seed(42)
-spots = [
-    '팝업스토어 A', '팝업스토어 B', '서울숲 공연장', '연무장길 카페거리', '성수역 부근',
-    '성수동 복합문화공간', '성수 창작소', '거리버스킹 ZONE', '성수동 야시장', '한강진입로 쉼터'
-]
-tags_pool = ['#팝업', '#공연', '#혼잡', '#무질서', '#축제', '#정상']
-data = []
-# 시간대 대신 실시간 기준으로 가장 가까운 슬롯 개념은 여기선 무시하고 랜덤 샘플만 사용
-for spot in spots:
-    lat = 37.544 + np.random.uniform(-0.003, 0.003)
-    lon = 127.056 + np.random.uniform(-0.003, 0.003)
-    popscore = random.randint(30, 100)  # 화제성
-    crowd = random.randint(50, 700)      # 혼잡도
-    card_spend = random.randint(100000, 2000000)  # 일별 카드 소비
-    traffic_flow = random.randint(30, 300)        # 일별 교통 유입
-    tag = random.choice(tags_pool)
-    data.append({
-        'spot': spot,
-        'lat': lat,
-        'lon': lon,
-        '화제성': popscore,
-        '혼잡도': crowd,
-        '일별_카드_소비액': card_spend,
-        '일별_교통_유입량': traffic_flow,
-        'tag': tag
-    })
-df_time = pd.DataFrame(data)
+@st.cache_resource
+def get_simulation():
+    return open_simulation(DEMO_SPOTS)
+
+@st.cache_resource
+def get_ingest(_simulation):
+    return open_ingest(_simulation.spots)
+
+# 장소 좌표는 바뀌지 않으므로 공간 색인도 한 번만 만듦 (위치 = df_time의 행 순서)
+@st.cache_resource
+def get_spot_index(_simulation):
+    return GridIndex(_simulation.lat, _simulation.lon)
+
+simulation = get_simulation()
+ingest = get_ingest(simulation)
+spot_index = get_spot_index(simulation)
+df_time = simulation.snapshot(now)
+if ingest is not None:
+    df_time = ingest.table.overlay(df_time)
+
+# 혼잡 분산 안내 기준: 이보다 붐비면 안내, 이보다 한산한 SPOT 중 반경 안에서 가까운 곳을 제안
+CONGESTED_THRESHOLD = 500
+UNCONGESTED_THRESHOLD = 300
+REDIRECT_RADIUS_M = 1000
+# SPOT 선택 목록에 거리순으로 보여 줄 개수
+NEARBY_LIMIT = 50
+
+# 현장 보고는 모든 역할/세션이 함께 보도록 프로세스당 하나의 저장소에 보관
+@st.cache_resource
+def get_report_log():
+    return open_report_log()
+
+report_log = get_report_log()
+
+# 보고가 수천 건 쌓여도 화면마다 최근 보고만 그리도록 제한
+REPORT_DISPLAY_LIMIT = 20
+HOME_REPORT_LIMIT = 10
+
+def render_reports(reports, total=None):
+    # 보고마다 markdown 요소를 만들지 않고 한 번에 그림
+    st.markdown("".join(
+        f"<div class='{'warning-log' if is_warning(r) else 'normal-log'}'>{format_report(r)}</div>" for r in reports
+    ), unsafe_allow_html=True)
+    if total is not None and total > len(reports):
+        st.caption(f"최근 {len(reports)}건만 표시 (전체 {total}건)")
 
 # session state 초기화
-if "logs" not in st.session_state:
-    st.session_state.logs = []
 if "selected_spot" not in st.session_state:
     st.session_state.selected_spot = None
 if "admin_chosen_spot" not in st.session_state:
@@ -101,6 +119,10 @@ with st.sidebar:
     now = datetime.now()
     current_time_str = now.strftime("%Y-%m-%d %H:%M:%S")
     st.markdown(f"🕒 **현재 시각:** {current_time_str}")
+    if ingest is not None:
+        last_batch_at = ingest.stats['last_batch_at']
+        lag = f"{time.time() - last_batch_at:.1f}초 전" if last_batch_at else "수신 대기 중"
+        st.caption(f"📡 실시간 수집: 초당 {ingest.stats['rate']:,.0f}건 · 누적 {ingest.stats['applied']:,}건 · 마지막 반영 {lag}")
     st.markdown("")
 
 # ---------------------------
@@ -186,18 +208,11 @@ if role == "홈":
     st.plotly_chart(fig_home, use_container_width=True)
 
     st.markdown("### 최근 보고된 현장 로그 (위험도 높은 항목 먼저)")
-    # 위험 로그: '매우 혼잡' 또는 '혼잡도' 표현을 포함한 것 (팝업운영자 보고 포맷 기준)
-    warning_logs = [l for l in st.session_state.logs if "매우 혼잡" in l or "혼잡도 '매우 혼잡'" in l]
-    normal_logs = [l for l in st.session_state.logs if l not in warning_logs]
-    if warning_logs:
-        st.markdown("위험도 높은 보고", unsafe_allow_html=True)
-        for l in warning_logs:
-            st.markdown(f"<div class='warning-log'>{l}</div>", unsafe_allow_html=True)
-    if normal_logs:
-        st.markdown("기타 보고")
-        for l in normal_logs[:10]:
-            st.markdown(f"<div class='normal-log'>{l}</div>", unsafe_allow_html=True)
-    if not st.session_state.logs:
+    # 위험도(팝업운영자가 보고한 혼잡도 등)가 높은 순, 같으면 최근 순
+    top_reports = report_log.top_risky(HOME_REPORT_LIMIT)
+    if top_reports:
+        render_reports(top_reports, len(report_log))
+    else:
         st.info("아직 보고된 내용이 없습니다.")
 
 # ---------- 팝업운영자 ----------
@@ -231,10 +246,8 @@ elif role == "팝업운영자":
         entrance_capacity = st.number_input("입장 가능 인원", min_value=0, max_value=100, value=10)
         comment = st.text_input("추가 코멘트", value="")
         if st.button("보고 전송"):
-            now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            entry = (f"[{now_str}] 팝업운영자 → {chosen_popup}: 혼잡도 '{congestion_label}', "
-                     f"대기 {wait_time}분, 입장 가능 {entrance_capacity}명, 코멘트 '{comment or row['tag']}'")
-            st.session_state.logs.insert(0, entry)
+            report_log.append(POPUP_ROLE, chosen_popup, congestion=congestion_label, wait_min=int(wait_time),
+                              capacity=int(entrance_capacity), comment=comment or row['tag'])
             st.success("현장 보고 접수됨")
 
 # ---------- 이동형 관광안내소 ----------
@@ -245,11 +258,11 @@ elif role == "이동형 관광안내소":
     st.info("현재 위치: 성수역 인근 (고정)")
     st.markdown(f"위치 좌표: {current_lat:.6f}, {current_lon:.6f}")
 
-    # 거리 계산
-    df_time["distance"] = np.sqrt((df_time["lat"] - current_lat) ** 2 + (df_time["lon"] - current_lon) ** 2)
-    df_time = df_time.sort_values("distance")
-    nearest = df_time.iloc[0]
-    emphasize_spot = st.session_state.selected_spot if st.session_state.selected_spot in df_time["spot"].values else nearest["spot"]
+    # 거리 계산: 공간 색인으로 가까운 SPOT만 실제 거리(m)순으로 찾음 (df_time은 바꾸지 않음)
+    nearby_positions, _ = spot_index.nearest(current_lat, current_lon, k=NEARBY_LIMIT)
+    nearby_spots = df_time["spot"].iloc[nearby_positions].tolist()
+    selected_known = simulation.position_of(st.session_state.selected_spot) is not None
+    emphasize_spot = st.session_state.selected_spot if selected_known else nearby_spots[0]
 
     fig = make_base_map(df_time, emphasize_spot=emphasize_spot, current_loc=(current_lat, current_lon),
                         center=(current_lat, current_lon))
@@ -258,12 +271,17 @@ elif role == "이동형 관광안내소":
     left, right = st.columns([2,1], gap="large")
     with left:
         st.markdown("#### SPOT 직접 선택 (거리순 우선)")
-        options = list(df_time["spot"].unique())
+        options = list(nearby_spots)
+        # 다른 화면에서 고른 먼 SPOT도 목록에서 유지
+        if selected_known and st.session_state.selected_spot not in options:
+            options.append(st.session_state.selected_spot)
         default_index = options.index(st.session_state.selected_spot) if st.session_state.selected_spot in options else 0
         chosen = st.selectbox("선택된 SPOT", options, index=default_index)
-        target = df_time[df_time["spot"] == chosen].iloc[0]
+        target_position = simulation.position_of(chosen)
+        target = df_time.iloc[target_position]
         st.session_state.selected_spot = chosen
-        st.markdown(f"##### 선택된 SPOT: {target['spot']}")
+        target_distance = float(haversine_m(current_lat, current_lon, target["lat"], target["lon"]))
+        st.markdown(f"##### 선택된 SPOT: {target['spot']} (현재 위치에서 {target_distance:,.0f}m)")
         c1, c2, c3, c4 = st.columns(4)
         c1.metric("혼잡도", f"{target['혼잡도']}명")
         c2.metric("화제성", target["화제성"])
@@ -273,8 +291,8 @@ elif role == "이동형 관광안내소":
 
     with right:
         st.markdown("#### 제안")
-        top3 = df_time.sort_values("혼잡도", ascending=False).head(3)[["spot","혼잡도"]]
-        low3 = df_time.sort_values("혼잡도", ascending=True).head(3)[["spot","혼잡도"]]
+        top3 = df_time.nlargest(3, "혼잡도")[["spot","혼잡도"]]
+        low3 = df_time.nsmallest(3, "혼잡도")[["spot","혼잡도"]]
         st.markdown("혼잡도 높은 3개")
         st.table(top3.rename(columns={"spot":"SPOT","혼잡도":"유동인구"}))
         st.markdown("혼잡도 낮은 3개")
@@ -285,16 +303,21 @@ elif role == "이동형 관광안내소":
     cause = st.selectbox("혼잡 원인", ['팝업 대기', '공연', '병목 현상', '유명인 방문'], key="cause")
     road = st.selectbox("도로 상태", ['정상', '쓰레기 적재', '불법 주정차', '시설물 파손'], key="road")
     if st.button("보고 전송"):
-        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        entry = (f"[{now_str}] 이동형 관광안내소 → {target['spot']}: 분위기 '{mood}', 원인 '{cause}', 도로 상태 '{road}'")
-        st.session_state.logs.insert(0, entry)
+        report_log.append(GUIDE_ROLE, target['spot'], mood=mood, cause=cause, road=road)
         st.success("상황 보고 완료")
 
     st.markdown("### 혼잡 분산 제안")
-    if target["혼잡도"] > 500:
+    if target["혼잡도"] > CONGESTED_THRESHOLD:
         st.warning("혼잡이 높습니다. 다른 SPOT으로 분산 안내하세요.")
-        alt = df_time[df_time["혼잡도"] < 300].sort_values("혼잡도")[["spot","혼잡도"]].head(3)
-        st.table(alt.rename(columns={"spot":"SPOT","혼잡도":"유동인구"}))
+        # 선택된 SPOT에서 가까운 순으로, 반경 안의 한산한 SPOT만
+        uncongested = df_time["혼잡도"].to_numpy() < UNCONGESTED_THRESHOLD
+        uncongested[target_position] = False
+        alt_positions, alt_distances = spot_index.nearest(target["lat"], target["lon"], k=3, where=uncongested, radius_m=REDIRECT_RADIUS_M)
+        if len(alt_positions):
+            alt = df_time.iloc[alt_positions][["spot","혼잡도"]].assign(거리=[f"{d:,.0f}m" for d in alt_distances])
+            st.table(alt.rename(columns={"spot":"SPOT","혼잡도":"유동인구"}))
+        else:
+            st.info(f"반경 {REDIRECT_RADIUS_M:,}m 안에 한산한 SPOT이 없습니다.")
     else:
         st.success("현재 SPOT은 안정적입니다.")
 
@@ -304,11 +327,10 @@ elif role == "총괄 관리자":
     st.markdown("### 주요장소 실시간 혼잡도 모니터링")
 
     # 위험도 높은 로그 우선 표시
-    warning_logs = [l for l in st.session_state.logs if "매우 혼잡" in l or "혼잡도 '매우 혼잡'" in l]
+    warning_logs = report_log.warnings(REPORT_DISPLAY_LIMIT)
     if warning_logs:
         st.markdown("#### ⚠️ 높은 위험도 보고")
-        for l in warning_logs:
-            st.markdown(f"<div class='warning-log'>{l}</div>", unsafe_allow_html=True)
+        render_reports(warning_logs, report_log.counts()[0])
 
     # 전체 정렬된 데이터
     df_sorted = df_time.sort_values("혼잡도", ascending=False).copy()
@@ -340,20 +362,19 @@ elif role == "총괄 관리자":
     c3.metric("일별 카드 소비액", f"{chosen_row['일별_카드_소비액']:,}원")
     c4.metric("일별 교통 유입량", chosen_row["일별_교통_유입량"])
     st.markdown(f"**자동 감지 태그:** {chosen_row['tag']}")
+    st.markdown("#### 오늘 시간대별 혼잡도")
+    st.line_chart(simulation.series(chosen_spot, '혼잡도', now))
 
 # ---------- 공통 로그 ----------
 st.markdown("---")
 st.subheader("📜 실시간 보고 로그")
 # 위험도 높은 항목 먼저
-warning_logs = [l for l in st.session_state.logs if "매우 혼잡" in l or "혼잡도 '매우 혼잡'" in l]
-normal_logs = [l for l in st.session_state.logs if l not in warning_logs]
-if warning_logs:
+warning_count, normal_count = report_log.counts()
+if warning_count:
     st.markdown("위험도 높은 보고")
-    for l in warning_logs:
-        st.markdown(f"<div class='warning-log'>{l}</div>", unsafe_allow_html=True)
-if normal_logs:
+    render_reports(report_log.warnings(REPORT_DISPLAY_LIMIT), warning_count)
+if normal_count:
     st.markdown("기타 보고")
-    for l in normal_logs:
-        st.markdown(f"<div class='normal-log'>{l}</div>", unsafe_allow_html=True)
-if not st.session_state.logs:
+    render_reports(report_log.normal(REPORT_DISPLAY_LIMIT), normal_count)
+if not (warning_count or normal_count):
     st.info("아직 보고된 로그가 없습니다.")
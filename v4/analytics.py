@@ -0,0 +1,185 @@
+# 관리자 클릭 분석용 집계 모듈 - 로그를 청크 단위로 읽어 누적하므로 메모리 사용량이 로그 크기와 무관
+
+import abc
+import json
+import os
+import threading
+from collections import Counter
+
+
+class _ChunkedClickAggregator(abc.ABC):
+    """저장소에 새로 추가된 클릭 로그만 청크 단위로 읽어 _consume()에 넘기는 공통 클래스"""
+
+    def __init__(self, chunksize=100000):
+        self.chunksize = chunksize
+        self.total = 0
+        self._cursor = 0
+        self._version = None
+        self._lock = threading.Lock()
+
+    def sync(self, store):
+        """마지막 집계 이후 추가된 클릭 로그만 반영 (데이터 버전이 같으면 생략). 새 로그가 있었으면 True"""
+        version = store.click_version()
+        with self._lock:
+            if version == self._version:
+                return False
+            changed = False
+            for chunk, cursor in store.iter_clicks_after(self._cursor, self.chunksize):
+                counts = chunk.groupby(['type', 'value']).size()
+                self._consume(counts)
+                self.total += len(chunk)
+                self._cursor = cursor
+                changed = True
+            self._version = version
+            return changed
+
+    def record(self, store, rows, cursor):
+        """방금 기록된 클릭 (timestamp, type, value) 목록을 로그를 다시 읽지 않고 바로 반영 (BatchedClickWriter 리스너용)
+        cursor는 rows 바로 뒤의 위치 - 그 사이에 다른 프로세스가 기록한 행이 있거나 알 수 없으면 sync()로 이어서 읽음"""
+        with self._lock:
+            if cursor is not None and self._version is not None and self._cursor == cursor - len(rows):
+                counts = Counter((log_type, value) for _, log_type, value in rows if value is not None)
+                self._consume(counts)
+                self.total += len(rows)
+                self._cursor = cursor
+                return True
+        return self.sync(store)
+
+    @abc.abstractmethod
+    def _consume(self, counts):
+        raise NotImplementedError
+
+
+class ClickRollup(_ChunkedClickAggregator):
+    """클릭 유형(type)별 값(value) 조회수를 정확히 누적 집계하는 클래스"""
+
+    def __init__(self, chunksize=100000):
+        super().__init__(chunksize)
+        self.counts = {}
+
+    def _consume(self, counts):
+        for (log_type, value), count in counts.items():
+            self.counts.setdefault(log_type, Counter())[value] += int(count)
+
+    def top(self, log_type, n=10):
+        """특정 유형의 조회수 상위 n개를 (값, 조회수) 목록으로 반환"""
+        with self._lock:
+            return self.counts.get(log_type, Counter()).most_common(n)
+
+
+class SpaceSaving:
+    """Space-Saving 빈도 스케치 - capacity개 항목만 유지하며, 각 개수의 과대 추정 오차는 전체/capacity 이하"""
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.items = {}  # 값 -> [추정 개수, 최대 오차]
+        self.n = 0
+
+    def update(self, value, weight=1):
+        self.n += weight
+        entry = self.items.get(value)
+        if entry is not None:
+            entry[0] += weight
+        elif len(self.items) < self.capacity:
+            self.items[value] = [weight, 0]
+        else:
+            # 가장 작은 항목을 내보내고 그 개수를 오차로 물려받음
+            victim = min(self.items, key=lambda v: self.items[v][0])
+            min_count = self.items.pop(victim)[0]
+            self.items[value] = [min_count + weight, min_count]
+
+    def top(self, k=10):
+        """추정 개수 상위 k개를 (값, 추정 개수, 최대 오차) 목록으로 반환"""
+        ranked = sorted(self.items.items(), key=lambda item: item[1][0], reverse=True)[:k]
+        return [(value, count, error) for value, (count, error) in ranked]
+
+    def error_bound(self):
+        """모든 추정 개수에 대해 보장되는 최대 오차 (항목 수가 capacity 미만이면 정확하므로 0)"""
+        return 0 if len(self.items) < self.capacity else self.n / self.capacity
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'n': self.n, 'items': self.items}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['capacity'])
+        sketch.n = data['n']
+        sketch.items = {value: list(entry) for value, entry in data['items'].items()}
+        return sketch
+
+
+class SketchedClickCounter(_ChunkedClickAggregator):
+    """클릭 유형별 Space-Saving 스케치 - 상태를 로그 옆 JSON 파일에 저장하여 재시작 후에도 이어서 집계"""
+
+    def __init__(self, path=None, capacity=256, chunksize=100000):
+        super().__init__(chunksize)
+        self.path = path
+        self.capacity = capacity
+        self.sketches = {}
+        self._store_kind = None
+
+    def _load(self, store):
+        # 저장 파일의 cursor는 같은 종류의 저장소에서만 의미가 있음
+        self._store_kind = type(store).__name__
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('store') != self._store_kind:
+            return
+        self.total = data['total']
+        self._cursor = data['cursor']
+        self.sketches = {log_type: SpaceSaving.from_dict(s) for log_type, s in data['sketches'].items()}
+
+    def _save(self):
+        if not self.path:
+            return
+        data = {
+            'store': self._store_kind,
+            'cursor': self._cursor,
+            'total': self.total,
+            'sketches': {log_type: s.to_dict() for log_type, s in self.sketches.items()},
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def sync(self, store):
+        if self._store_kind is None:
+            with self._lock:
+                self._load(store)
+        changed = super().sync(store)
+        if changed:
+            with self._lock:
+                self._save()
+        return changed
+
+    def record(self, store, rows, cursor):
+        # 처음 한 번은 sync()로 저장 파일을 불러오고 밀린 로그를 따라잡은 뒤부터 배치를 바로 반영
+        changed = super().record(store, rows, cursor)
+        if changed:
+            with self._lock:
+                self._save()
+        return changed
+
+    def _consume(self, counts):
+        for (log_type, value), count in counts.items():
+            sketch = self.sketches.get(log_type)
+            if sketch is None:
+                sketch = self.sketches[log_type] = SpaceSaving(self.capacity)
+            sketch.update(value, int(count))
+
+    def top(self, log_type, n=10):
+        """특정 유형의 추정 조회수 상위 n개를 (값, 추정 개수, 최대 오차) 목록으로 반환"""
+        with self._lock:
+            sketch = self.sketches.get(log_type)
+            return sketch.top(n) if sketch else []
+
+    def error_bound(self, log_type):
+        with self._lock:
+            sketch = self.sketches.get(log_type)
+            return sketch.error_bound() if sketch else 0
@@ -0,0 +1,361 @@
+# 데이터/렌더링 경로 성능 측정 스크립트 - 현재 데이터를 배율만큼 늘린 합성 데이터로 주요 함수의 시간과 최대 메모리를 기록
+# 사용법: python benchmark.py [--scales 1,100,1000] [--repeat 3] [-o bench.json] [--compare 이전_결과.json]
+# 배율마다 별도 프로세스에서 실행하므로 Streamlit 캐시와 메모리 측정이 서로 섞이지 않음
+# bench_baseline.json은 1x/100x 기준 결과 (--compare bench_baseline.json으로 비교), 측정 하나가 실패하면 실패로 기록하고 계속 진행
+
+import argparse
+import gc
+import inspect
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from storage import CLICK_COLUMNS, FEEDBACK_COLUMNS, FEEDBACK_FILE, LOG_FILE, read_feedback_csv
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = 'data_ver2.csv'
+# 저장소에는 클릭 로그 원본이 없으므로 리뷰 1건당 클릭 2건 정도를 현재 규모로 가정
+BASE_CLICKS = 3000
+# 느려짐으로 표시할 기준 (이전 결과 대비 배수)
+REGRESSION_RATIO = 1.2
+# 측정 프로세스가 결과를 남기는 파일 (합성 데이터 폴더 안)
+WORKER_RESULT = 'bench_result.json'
+
+
+def generate_dataset(out_dir, scale, seed=0):
+    """data_ver2.csv / feedback.csv / click_log.csv를 scale배로 늘린 합성 데이터를 out_dir에 생성하고 행 수를 반환"""
+    rng = np.random.default_rng(seed)
+    stores = pd.read_csv(os.path.join(BASE_DIR, DATA_FILE))
+    feedback = read_feedback_csv(os.path.join(BASE_DIR, FEEDBACK_FILE)).dropna(subset=['store_name'])
+
+    # 가게: 원본 행을 복제하고, 복제본은 이름에 번호를 붙이고 좌표를 약간(약 200m) 흔듦
+    n_stores = len(stores) * scale
+    copy = np.repeat(np.arange(scale), len(stores))
+    synthetic = stores.iloc[np.tile(np.arange(len(stores)), scale)].reset_index(drop=True)
+    suffix = pd.Series(np.where(copy > 0, ' #' + copy.astype(str), ''))
+    synthetic['가게이름'] = synthetic['가게이름'].astype(str) + suffix
+    synthetic['구분'] = np.arange(1, n_stores + 1)
+    jitter = np.where(copy > 0, 1.0, 0.0)
+    synthetic['lat'] = synthetic['lat'] + rng.normal(0, 0.002, n_stores) * jitter
+    synthetic['lon'] = synthetic['lon'] + rng.normal(0, 0.002, n_stores) * jitter
+    synthetic.to_csv(os.path.join(out_dir, DATA_FILE), index=False)
+
+    # 리뷰/클릭: 인기 가게에 몰리도록 Zipf 분포로 가게를 고르고, 최근 90일에 걸쳐 시간순으로 배치
+    names = synthetic['가게이름'].to_numpy()
+    order = rng.permutation(n_stores)
+
+    def pick_stores(count):
+        ranks = np.minimum(rng.zipf(1.3, count) - 1, n_stores - 1)
+        return names[order[ranks]]
+
+    def timestamps(count):
+        start = datetime.now() - timedelta(days=90)
+        seconds = np.sort(rng.uniform(0, 90 * 24 * 3600, count))
+        return (pd.Timestamp(start) + pd.to_timedelta(seconds, unit='s')).strftime('%Y-%m-%d %H:%M:%S.%f')
+
+    n_feedback = len(feedback) * scale
+    sample = rng.integers(0, len(feedback), n_feedback)
+    pd.DataFrame({
+        'timestamp': timestamps(n_feedback),
+        'store_name': pick_stores(n_feedback),
+        'rating': feedback['rating'].to_numpy()[sample],
+        'review': feedback['review'].to_numpy()[sample],
+    }, columns=FEEDBACK_COLUMNS).to_csv(os.path.join(out_dir, FEEDBACK_FILE), index=False, encoding='utf-8-sig')
+
+    n_clicks = BASE_CLICKS * scale
+    majors = stores['카테코리(대)'].dropna().unique()
+    subs = stores['카테고리(중)'].dropna().unique()
+    kind = rng.choice(3, n_clicks, p=[0.7, 0.1, 0.2])
+    values = pick_stores(n_clicks).astype(object)
+    values[kind == 1] = rng.choice(majors, int((kind == 1).sum()))
+    values[kind == 2] = rng.choice(subs, int((kind == 2).sum()))
+    pd.DataFrame({
+        'timestamp': timestamps(n_clicks),
+        'type': np.array(['store_view', 'major_category', 'sub_category'])[kind],
+        'value': values,
+    }, columns=CLICK_COLUMNS).to_csv(os.path.join(out_dir, LOG_FILE), index=False)
+
+    return {'stores': n_stores, 'feedback': n_feedback, 'clicks': n_clicks}
+
+
+def prepare_app_dir(out_dir):
+    """앱 코드와 폰트를 합성 데이터 폴더로 복사 (앱은 스크립트 위치 기준으로 데이터 파일을 찾음)"""
+    for name in os.listdir(BASE_DIR):
+        if name.endswith('.py') or name.endswith('.ttf'):
+            shutil.copy(os.path.join(BASE_DIR, name), out_dir)
+
+
+def record_failure(name, error, results):
+    """측정 하나가 실패하면 오류를 결과에 남기고 나머지 측정은 계속 진행"""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    message = f"{type(error).__name__}: {error}"
+    results.append({'name': name, 'error': message})
+    print(f"  {name:<44} ❌ 실패 - {message}", file=sys.stderr)
+
+
+def check_call(name, func, results, *args, **kwargs):
+    """벤치마크가 넘기는 인자가 앱 함수의 현재 시그니처와 맞는지 미리 확인 (맞지 않으면 실패로 기록하고 False)"""
+    try:
+        inspect.signature(func).bind(*args, **kwargs)
+    except TypeError as e:
+        record_failure(f"{name} (API 확인)", e, results)
+        return False
+    return True
+
+
+def measure(name, fn, repeat, results):
+    """fn을 repeat번 실행한 시간(최소/중앙값)과, 추가 1회 실행 중 tracemalloc으로 잰 최대 메모리를 기록"""
+    timings = []
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    except Exception as e:
+        record_failure(name, e, results)
+        return
+
+    results.append({
+        'name': name,
+        'seconds_min': min(timings),
+        'seconds_median': float(np.median(timings)),
+        'repeat': repeat,
+        'peak_bytes': peak,
+    })
+    print(f"  {name:<44} {min(timings) * 1000:10.1f} ms  {peak / 2**20:8.1f} MiB", file=sys.stderr)
+
+
+def measure_once(name, fn, results):
+    """한 번만 의미가 있는 작업(최초 이관, 콜드 스타트)은 tracemalloc을 켠 채 1회만 측정"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        value = fn()
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    except Exception as e:
+        record_failure(name, e, results)
+        return None
+    tracemalloc.stop()
+    results.append({'name': name, 'seconds_min': seconds, 'seconds_median': seconds, 'repeat': 1, 'peak_bytes': peak})
+    print(f"  {name:<44} {seconds * 1000:10.1f} ms  {peak / 2**20:8.1f} MiB (1회)", file=sys.stderr)
+    return value
+
+
+def _quiet_streamlit():
+    # 스크립트 밖(bare mode)에서 st.* 를 호출할 때마다 나오는 경고를 숨김
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith('streamlit'):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+
+def run_worker(app_dir, repeat):
+    """app_dir의 합성 데이터로 각 함수를 측정하여 결과 목록을 반환 (별도 프로세스에서 실행)"""
+    sys.path.insert(0, app_dir)
+    os.chdir(app_dir)
+    from storage import open_store
+    from catalog import StoreCatalog, build_snapshot, load_catalog
+    from ranking import RankingEngine
+    from reviews import FeedbackIndex
+    from keywords import KeywordIndex
+    from analytics import ClickRollup, SketchedClickCounter
+
+    results = []
+    measure_once('open_store (CSV → SQLite 최초 이관)', lambda: open_store(app_dir), results)
+    v4 = measure_once('import v4 (콜드 스타트 + 홈 렌더링)', lambda: __import__('v4'), results)
+    if v4 is None:
+        return results
+    _quiet_streamlit()
+    store = v4.get_event_store()
+
+    data_file = os.path.join(app_dir, DATA_FILE)
+    measure('load_data_and_calculate_stats', lambda: v4.load_data_and_calculate_stats(data_file), repeat, results)
+    merged = v4.load_data_and_calculate_stats(data_file)
+    measure('StoreCatalog + RankingEngine 생성', lambda: RankingEngine(StoreCatalog(merged).frame, v4.RANK_WEIGHTS), repeat, results)
+    # 가게 조회/리뷰로 통계만 바뀐 경우의 갱신 경로 (가게 데이터는 다시 읽지 않음)
+    base = v4.get_base_catalog(data_file, v4.get_catalog_version(data_file))
+    measure('통계만 갱신 (store_stat_columns + RankingEngine)', lambda: RankingEngine(base.with_columns(**v4.store_stat_columns(base.frame)).frame, v4.RANK_WEIGHTS), repeat, results)
+    largest_major = merged['카테고리(대)'].value_counts().index[0]
+    measure('get_sub_category_stats', lambda: v4.get_sub_category_stats(largest_major), repeat, results)
+
+    measure('load_feedback_data_stable', v4.load_feedback_data_stable, repeat, results)
+    feedback = v4.load_feedback_data_stable()
+    measure('FeedbackIndex 생성', lambda: FeedbackIndex(feedback), repeat, results)
+    measure('KeywordIndex.sync (전체 리뷰)', lambda: KeywordIndex().sync(store), repeat, results)
+
+    v4.get_synced_keyword_index()
+    # 앱의 함수 시그니처가 바뀌어 호출이 맞지 않으면 측정 대신 실패로 기록
+    if check_call('generate_word_cloud', v4.generate_word_cloud, results, title="warmup", store_name=None):
+        # 첫 워드 클라우드는 wordcloud/matplotlib import 시간을 포함하므로 따로 기록
+        measure_once('generate_word_cloud (첫 호출, 라이브러리 import 포함)', lambda: v4.generate_word_cloud(title="warmup", store_name=None), results)
+        titles = iter(range(10 ** 6))
+        measure('generate_word_cloud (디스크 캐시 미스)', lambda: v4.generate_word_cloud(title=f"bench {next(titles)}", store_name=None), repeat, results)
+        measure('generate_word_cloud (디스크 캐시 적중)', lambda: v4.generate_word_cloud(title="bench 0", store_name=None), repeat, results)
+
+    def exact_rollup():
+        rollup = ClickRollup()
+        rollup.sync(store)
+        return [rollup.top(log_type) for log_type in ('store_view', 'major_category', 'sub_category')]
+
+    def sketched_rollup():
+        sketch = SketchedClickCounter()
+        sketch.sync(store)
+        return [sketch.top(log_type) for log_type in ('store_view', 'major_category', 'sub_category')]
+
+    measure('관리자 클릭 집계 (정확, ClickRollup)', exact_rollup, repeat, results)
+    measure('관리자 클릭 집계 (근사, SketchedClickCounter)', sketched_rollup, repeat, results)
+    measure('관리자 로그 페이지 조회 (100건)', lambda: store.read_clicks_page(0, 100), repeat, results)
+
+    snapshot = os.path.join(app_dir, 'catalog.arrow')
+    measure('build_snapshot (catalog.arrow 생성)', lambda: build_snapshot(data_file, snapshot), repeat, results)
+    measure('load_catalog (스냅샷)', lambda: load_catalog(data_file, snapshot), repeat, results)
+    measure('load_catalog (CSV)', lambda: load_catalog(data_file), repeat, results)
+
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_scale(scale, repeat, seed, keep_dir=None):
+    """합성 데이터를 만들고 별도 프로세스에서 측정한 결과를 반환 (측정 프로세스가 실패하면 'error'에 기록)"""
+    out_dir = keep_dir or tempfile.mkdtemp(prefix=f'kusis_bench_{scale}x_')
+    os.makedirs(out_dir, exist_ok=True)
+    rows = None
+    try:
+        print(f"[{scale}x] 합성 데이터 생성: {out_dir}", file=sys.stderr)
+        start = time.perf_counter()
+        rows = generate_dataset(out_dir, scale, seed)
+        print(f"[{scale}x] 가게 {rows['stores']:,} / 리뷰 {rows['feedback']:,} / 클릭 {rows['clicks']:,} ({time.perf_counter() - start:.1f}초)", file=sys.stderr)
+        prepare_app_dir(out_dir)
+
+        env = dict(os.environ, KUSIS_STORE_BACKEND='sqlite')
+        proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--worker', out_dir, '--repeat', str(repeat)],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        # 측정 진행 상황은 그대로 보여 주되, bare mode에서 반복되는 Streamlit 경고는 걸러 냄
+        for line in proc.stderr:
+            if 'ScriptRunContext' not in line and 'bare mode' not in line:
+                sys.stderr.write(line)
+        if proc.wait() != 0:
+            raise RuntimeError(f"{scale}x 측정 프로세스가 실패했습니다 (종료 코드 {proc.returncode})")
+        with open(os.path.join(out_dir, WORKER_RESULT), encoding='utf-8') as f:
+            worker = json.load(f)
+        return {'scale': scale, 'rows': rows, 'max_rss_bytes': worker['max_rss_bytes'], 'results': worker['results']}
+    except Exception as e:
+        # 한 배율이 실패해도 다른 배율은 계속 측정
+        print(f"[{scale}x] ❌ {e}", file=sys.stderr)
+        return {'scale': scale, 'rows': rows, 'error': f"{type(e).__name__}: {e}", 'results': []}
+    finally:
+        if keep_dir is None:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+
+def compare(current, previous_path):
+    """이전 결과 파일과 (배율, 이름)별 최소 시간을 비교하여 출력하고, 느려진 항목 수를 반환"""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+    before = {(run['scale'], r['name']): r.get('seconds_min') for run in previous['runs'] for r in run['results']}
+    regressions = 0
+    print(f"\n이전 결과({previous['meta'].get('git_commit')}) 대비 최소 시간 비율:")
+    for run in current['runs']:
+        for r in run['results']:
+            old = before.get((run['scale'], r['name']))
+            if not old or 'error' in r:
+                continue
+            ratio = r['seconds_min'] / old
+            flag = '  ⚠️ 느려짐' if ratio > REGRESSION_RATIO else ''
+            regressions += bool(flag)
+            print(f"  [{run['scale']}x] {r['name']:<44} {old * 1000:10.1f} → {r['seconds_min'] * 1000:10.1f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def count_failures(report):
+    """실패한 배율/측정 항목을 출력하고 개수를 반환"""
+    failures = 0
+    for run in report['runs']:
+        if 'error' in run:
+            failures += 1
+            print(f"❌ [{run['scale']}x] {run['error']}", file=sys.stderr)
+        for r in run['results']:
+            if 'error' in r:
+                failures += 1
+                print(f"❌ [{run['scale']}x] {r['name']}: {r['error']}", file=sys.stderr)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 데이터로 KUSIS 데이터/렌더링 경로의 시간과 메모리를 측정합니다.")
+    parser.add_argument('--scales', default='1,100', help="데이터 배율 목록 (쉼표 구분, 예: 1,100,1000,10000)")
+    parser.add_argument('--repeat', type=int, default=3, help="함수별 반복 횟수 (최소/중앙값 계산)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="결과 JSON 파일 경로 (없으면 표준 출력)")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON 파일 (느려진 항목이 있으면 종료 코드 1)")
+    parser.add_argument('--keep-data', help="합성 데이터를 지우지 않고 이 폴더 아래에 배율별로 남김")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        results = run_worker(args.worker, args.repeat)
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Linux는 KiB 단위
+        with open(os.path.join(args.worker, WORKER_RESULT), 'w', encoding='utf-8') as f:
+            json.dump({'results': results, 'max_rss_bytes': max_rss}, f)
+        return 0
+
+    report = {
+        'meta': {
+            'git_commit': git_commit(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+        },
+        'runs': [],
+    }
+    for scale in (int(s) for s in args.scales.split(',') if s.strip()):
+        keep_dir = os.path.join(args.keep_data, f'{scale}x') if args.keep_data else None
+        report['runs'].append(run_scale(scale, args.repeat, args.seed, keep_dir))
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    # 실패한 측정이 있거나 이전 결과보다 느려진 항목이 있으면 종료 코드 1
+    failed = count_failures(report)
+    regressed = compare(report, args.compare) if args.compare else 0
+    return 1 if failed or regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+# 가게 카탈로그 스냅샷 생성 스크립트 (배포 전에 한 번 실행)
+# 사용법: python build_catalog.py [원본 CSV] [-o 스냅샷 경로]
+
+import argparse
+import os
+import sys
+import time
+
+from catalog import build_snapshot
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CSV = os.path.join(BASE_DIR, 'data_ver2.csv')
+DEFAULT_SNAPSHOT = os.path.join(BASE_DIR, 'catalog.arrow')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="data_ver2.csv를 검증/정규화하여 Arrow 스냅샷(catalog.arrow)으로 저장합니다.")
+    parser.add_argument('csv', nargs='?', default=DEFAULT_CSV, help="원본 가게 데이터 CSV (기본: data_ver2.csv)")
+    parser.add_argument('-o', '--output', default=DEFAULT_SNAPSHOT, help="스냅샷 파일 경로 (기본: catalog.arrow)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        rows, dropped = build_snapshot(args.csv, args.output)
+    except ImportError:
+        print("❌ 스냅샷 생성 실패: pyarrow가 설치되어 있지 않습니다. 'pip install pyarrow' 후 다시 실행해주세요.", file=sys.stderr)
+        return 1
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ 스냅샷 생성 실패: {e}", file=sys.stderr)
+        return 1
+
+    print(f"✅ {args.output}: {rows}개 가게 저장 ({time.perf_counter() - start:.2f}초)")
+    for reason, count in dropped.items():
+        if count:
+            print(f"   - 제외: {reason} {count}행")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
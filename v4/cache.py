@@ -0,0 +1,62 @@
+# 데이터 버전 기반 캐시 (데이터가 실제로 바뀐 경우에만 다시 계산)
+
+import threading
+
+
+class VersionedCache:
+    """키별로 (버전, 값)을 보관하고, 버전이 같으면 저장된 값을 그대로 돌려주는 캐시"""
+
+    def __init__(self):
+        self._entries = {}
+        # 전체 락은 항목 조회/저장에만 짧게 쓰고, 계산 중에는 키별 락만 잡아서 다른 키의 조회를 막지 않음
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key, version):
+        # 전체 락을 잡은 상태에서 호출
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return True, entry[1]
+        return False, None
+
+    def get(self, key, version, builder):
+        """버전이 일치하면 캐시된 값을, 아니면 builder()를 호출해 새 값을 저장 후 반환"""
+        with self._lock:
+            found, value = self._lookup(key, version)
+            if found:
+                return value
+            key_lock = self._key_locks.setdefault(key, threading.RLock())
+
+        # 같은 키를 여러 세션이 동시에 다시 계산하지 않도록, 키별 락을 잡은 뒤 다른 세션이 이미 만들었는지 다시 확인
+        with key_lock:
+            with self._lock:
+                found, value = self._lookup(key, version)
+                if found:
+                    return value
+                self.misses += 1
+            value = builder()
+            with self._lock:
+                self._entries[key] = (version, value)
+            return value
+
+    def invalidate(self, key=None):
+        """특정 키(또는 전체)의 캐시를 비우는 함수"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """적중/실패 횟수와 적중률을 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+            }
@@ -0,0 +1,257 @@
+# 가게 카탈로그 - 카테고리는 category, 좌표는 float32, 긴 텍스트는 한 덩어리 바이트로 따로 보관하는 압축 표현
+# 배포 시 build_catalog.py로 정규화된 Arrow 스냅샷을 만들어 두면 시작할 때 CSV 대신 메모리 매핑으로 읽음
+
+import copy
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from storage import file_version
+
+# 목록 화면에서는 쓰지 않고 상세 페이지/검색 색인에서만 읽는 긴 텍스트 컬럼
+TEXT_COLUMNS = ('caption', 'link', '주소')
+CATEGORY_COLUMNS = ('카테고리(대)', '카테고리(중)')
+COORD_COLUMNS = ('lat', 'lon')
+REQUIRED_COLUMNS = ('가게이름', '카테고리(대)', '카테고리(중)', 'lat', 'lon')
+
+# 스냅샷 형식이 바뀌면 올려서 이전 스냅샷을 자동으로 무시하게 함
+SNAPSHOT_FORMAT = '1'
+
+
+def normalize_catalog(data):
+    """원본 가게 데이터를 검증/정규화하여 (DataFrame, 제외된 행 수 dict)를 반환 (필수 컬럼이 없으면 ValueError)"""
+    data = data.rename(columns={'카테코리(대)': '카테고리(대)'})
+    missing = [column for column in REQUIRED_COLUMNS if column not in data.columns]
+    if missing:
+        raise ValueError(f"가게 데이터에 필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    dropped = {}
+    data = data.assign(
+        lat=pd.to_numeric(data['lat'], errors='coerce'),
+        lon=pd.to_numeric(data['lon'], errors='coerce'),
+    )
+    no_coords = data['lat'].isna() | data['lon'].isna()
+    out_of_range = ~no_coords & ~(data['lat'].between(-90, 90) & data['lon'].between(-180, 180))
+    no_name = data['가게이름'].isna()
+    dropped['좌표 없음'] = int(no_coords.sum())
+    dropped['좌표 범위 오류'] = int(out_of_range.sum())
+    dropped['이름 없음'] = int((no_name & ~no_coords & ~out_of_range).sum())
+    data = data[~(no_coords | out_of_range | no_name)].reset_index(drop=True)
+
+    data['카테고리(대)'] = data['카테고리(대)'].fillna('기타')
+    data['카테고리(중)'] = data['카테고리(중)'].fillna('기타')
+    return data, dropped
+
+
+def source_signature(path):
+    """원본 CSV의 크기, 수정 시각, 내용 해시 (스냅샷이 최신인지 확인하는 데 사용)"""
+    mtime_ns, size = file_version(path)
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {'size': str(size), 'mtime_ns': str(mtime_ns), 'sha256': digest}
+
+
+def build_snapshot(csv_path, snapshot_path):
+    """CSV를 한 번 검증/정규화하여 Arrow IPC 스냅샷으로 저장하고 (저장된 행 수, 제외된 행 수 dict)를 반환"""
+    import pyarrow as pa
+
+    data, dropped = normalize_catalog(pd.read_csv(csv_path))
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    signature = source_signature(csv_path)
+    metadata = dict(table.schema.metadata or {})
+    metadata.update({f'kusis.{key}'.encode(): value.encode() for key, value in signature.items()})
+    metadata[b'kusis.format'] = SNAPSHOT_FORMAT.encode()
+    table = table.replace_schema_metadata(metadata)
+
+    # 압축하지 않은 IPC 파일이어야 읽을 때 복사 없이 메모리 매핑 가능
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, snapshot_path)
+    return len(data), dropped
+
+
+def load_snapshot(snapshot_path, csv_path):
+    """스냅샷이 있고 원본 CSV와 일치하면 메모리 매핑으로 읽은 DataFrame을, 없거나 오래되었으면 None을 반환"""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+    if file_version(snapshot_path) is None:
+        return None
+
+    try:
+        reader = pa.ipc.open_file(pa.memory_map(snapshot_path, 'r'))
+    except (OSError, pa.ArrowInvalid):
+        return None
+    metadata = {key.decode(): value.decode() for key, value in (reader.schema.metadata or {}).items()}
+    if metadata.get('kusis.format') != SNAPSHOT_FORMAT:
+        return None
+
+    # 원본 CSV가 없으면 스냅샷만 배포된 것으로 보고 그대로 사용
+    current = file_version(csv_path)
+    if current is not None:
+        mtime_ns, size = current
+        if str(size) != metadata.get('kusis.size'):
+            return None
+        # 수정 시각이 다르면 (예: git clone 직후) 내용 해시로 다시 확인
+        if str(mtime_ns) != metadata.get('kusis.mtime_ns') and source_signature(csv_path)['sha256'] != metadata.get('kusis.sha256'):
+            return None
+    return reader.read_all().to_pandas()
+
+
+def load_catalog(csv_path, snapshot_path=None):
+    """최신 스냅샷이 있으면 스냅샷을, 없으면 CSV를 읽어 정규화한 가게 데이터를 반환 (둘 다 없으면 FileNotFoundError)"""
+    if snapshot_path is not None:
+        data = load_snapshot(snapshot_path, csv_path)
+        if data is not None:
+            return data
+    data, _ = normalize_catalog(pd.read_csv(csv_path))
+    return data
+
+
+class PackedText:
+    """문자열 목록을 UTF-8 바이트 한 덩어리 + 시작 위치 배열로 저장 (문자열 객체를 행마다 들고 있지 않음)"""
+
+    def __init__(self, values):
+        encoded = [None if value is None or value != value else str(value).encode('utf-8') for value in values]
+        self.present = np.array([value is not None for value in encoded], dtype=bool)
+        lengths = np.fromiter((len(value) if value is not None else 0 for value in encoded), dtype='int64', count=len(encoded))
+        self.offsets = np.zeros(len(encoded) + 1, dtype='int64')
+        np.cumsum(lengths, out=self.offsets[1:])
+        self.blob = b''.join(value for value in encoded if value is not None)
+
+    @classmethod
+    def from_series(cls, series):
+        """Arrow 문자열 컬럼이면 Arrow 버퍼(스냅샷에서 읽었다면 메모리 매핑된 영역)를 복사 없이 그대로 사용"""
+        try:
+            import pyarrow as pa
+            array = pa.array(series)
+        except (ImportError, TypeError, ValueError):
+            return cls(series.tolist())
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        if array.type == pa.large_string():
+            offset_type = 'int64'
+        elif array.type == pa.string():
+            offset_type = 'int32'
+        else:
+            return cls(series.tolist())
+
+        packed = cls.__new__(cls)
+        packed.present = array.is_valid().to_numpy(zero_copy_only=False)
+        _, offsets_buffer, data_buffer = array.buffers()
+        packed.offsets = np.frombuffer(offsets_buffer, dtype=offset_type)[array.offset:array.offset + len(array) + 1]
+        packed.blob = memoryview(data_buffer) if data_buffer is not None else b''
+        return packed
+
+    def __len__(self):
+        return len(self.present)
+
+    def get(self, row):
+        if not self.present[row]:
+            return None
+        return bytes(self.blob[self.offsets[row]:self.offsets[row + 1]]).decode('utf-8')
+
+    def take(self, rows):
+        return [self.get(row) for row in rows]
+
+    @property
+    def nbytes(self):
+        return len(self.blob) + self.offsets.nbytes + self.present.nbytes
+
+
+class StoreCatalog:
+    """가게 목록의 압축 표현 - frame(목록용 컬럼) + 긴 텍스트 + 이름/카테고리별 행 위치 맵"""
+
+    def __init__(self, df):
+        frame = df.reset_index(drop=True)
+        self.text = {column: PackedText.from_series(frame[column]) for column in TEXT_COLUMNS if column in frame.columns}
+        frame = frame.drop(columns=list(self.text))
+        for column in CATEGORY_COLUMNS:
+            if column in frame.columns:
+                frame[column] = frame[column].astype('category')
+        for column in COORD_COLUMNS:
+            if column in frame.columns:
+                frame[column] = frame[column].astype('float32')
+        self.frame = frame
+
+        # 페이지마다 불리언 마스크로 거르지 않도록 카테고리 → 행 위치를 미리 계산
+        self._by_major = {}
+        self._by_sub = {}
+        self._row_by_name = {}
+        if frame.empty:
+            return
+        self._by_major = dict(frame.groupby('카테고리(대)', sort=False, observed=True).indices)
+        self._by_sub = dict(frame.groupby('카테고리(중)', sort=False, observed=True).indices)
+        for row, name in enumerate(frame['가게이름'].tolist()):
+            self._row_by_name.setdefault(name, row)
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def empty(self):
+        return self.frame.empty
+
+    def major_categories(self):
+        """데이터에 처음 등장한 순서대로 대분류 목록을 반환"""
+        return list(self._by_major)
+
+    def rows_for_major(self, major):
+        return self.frame.iloc[self._by_major.get(major, [])]
+
+    def rows_for_sub(self, sub_category):
+        return self.frame.iloc[self._by_sub.get(sub_category, [])]
+
+    def row_of(self, store_name):
+        return self._row_by_name.get(store_name)
+
+    def details(self, store_name):
+        """상세 페이지용 한 가게의 전체 정보 (긴 텍스트 포함, 없으면 None)"""
+        row = self.row_of(store_name)
+        if row is None:
+            return None
+        details = self.frame.iloc[row].copy()
+        for column, packed in self.text.items():
+            details[column] = packed.get(row)
+        return details
+
+    def with_columns(self, **columns):
+        """긴 텍스트와 행 위치 맵은 그대로 공유하고 frame에 컬럼만 덧붙인 새 카탈로그 (통계처럼 자주 바뀌는 값용)"""
+        catalog = copy.copy(self)
+        catalog.frame = self.frame.assign(**columns)
+        return catalog
+
+    def with_text(self, columns=None):
+        """긴 텍스트 컬럼을 다시 붙인 전체 DataFrame (검색 색인처럼 전체 텍스트가 필요한 곳에서 한 번만 사용)"""
+        frame = self.frame.copy()
+        for column in columns or self.text:
+            frame[column] = pd.Series(self.text[column].take(range(len(self))), index=frame.index)
+        return frame
+
+    def memory_report(self):
+        """컬럼별 메모리 사용량(bytes)을 기존 표현(문자열 컬럼, float64 좌표) 및 object 컬럼 표현과 비교한 DataFrame"""
+        original = self.with_text()
+        for column in CATEGORY_COLUMNS:
+            if column in original.columns:
+                original[column] = pd.Series(original[column].tolist(), index=original.index)
+        for column in COORD_COLUMNS:
+            if column in original.columns:
+                original[column] = original[column].astype('float64')
+
+        # pandas 버전/pyarrow 설치 여부에 따라 문자열 컬럼이 object일 수도 Arrow 문자열일 수도 있으므로 둘 다 표시
+        as_object = original.astype(object).memory_usage(deep=True, index=False)
+        before = original.memory_usage(deep=True, index=False)
+        after = self.frame.memory_usage(deep=True, index=False)
+        for column, packed in self.text.items():
+            after[column] = packed.nbytes
+        report = pd.DataFrame({
+            'object 표현': as_object, '기존': before, '압축': after.reindex(before.index)
+        }).fillna(0).astype('int64')
+        report.loc['합계'] = report.sum()
+        report['절감률'] = (1 - report['압축'] / report['기존'].where(report['기존'] > 0)).round(3)
+        return report
@@ -0,0 +1,127 @@
+# 클릭 로그 비동기 일괄 기록기 (버튼 처리 중에는 큐에 넣기만 하고 기록은 백그라운드 스레드가 담당)
+
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+
+_STOP = object()
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class BatchedClickWriter:
+    """클릭 이벤트를 모아서 개수(max_batch) 또는 시간(flush_interval초) 기준으로 저장소에 기록"""
+
+    def __init__(self, store, max_batch=200, flush_interval=1.0, max_queue=10000):
+        self.store = store
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._count_lock = threading.Lock()
+        # 운영 확인용 카운터
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.listener_errors = 0
+        # 기록이 끝난 배치를 넘겨받을 함수 목록 - listener(store, batch, cursor)
+        self._listeners = []
+        self._thread = threading.Thread(target=self._run, name='click-writer', daemon=True)
+        self._thread.start()
+        # 프로세스 종료 시 남은 이벤트를 기록
+        atexit.register(self.close)
+
+    def add_listener(self, listener):
+        """배치가 저장소에 기록될 때마다 기록 스레드에서 listener(store, batch, cursor)를 호출하도록 등록"""
+        self._listeners.append(listener)
+
+    def log(self, log_type, value, timestamp=None):
+        """클릭 이벤트를 큐에 넣는 함수 (큐가 가득 차면 기다리지 않고 버린 뒤 dropped 증가)"""
+        accepted = not self._closed
+        if accepted:
+            try:
+                self._queue.put_nowait((timestamp or datetime.now(), log_type, value))
+            except queue.Full:
+                accepted = False
+        with self._count_lock:
+            if accepted:
+                self.enqueued += 1
+            else:
+                self.dropped += 1
+        return accepted
+
+    def flush(self, timeout=None):
+        """지금까지 큐에 쌓인 이벤트를 모두 기록할 때까지 기다리는 함수"""
+        if not self._thread.is_alive():
+            return False
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """남은 이벤트를 기록하고 기록 스레드를 종료하는 함수"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'listener_errors': self.listener_errors,
+            'pending': self._queue.qsize(),
+        }
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            cursor = self.store.append_clicks(batch)
+            self.written += len(batch)
+        except Exception:
+            # 저장소 오류가 나도 기록 스레드는 계속 동작하도록 실패 개수만 기록
+            self.failed += len(batch)
+            return
+        for listener in self._listeners:
+            try:
+                listener(self.store, batch, cursor)
+            except Exception:
+                self.listener_errors += 1
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write(batch)
+                return
+            if isinstance(item, _FlushRequest):
+                self._write(batch)
+                batch = []
+                item.done.set()
+                continue
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+
+            if len(batch) >= self.max_batch or (batch and time.monotonic() >= deadline):
+                self._write(batch)
+                batch = []
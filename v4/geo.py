@@ -0,0 +1,125 @@
+# 위치 기반 검색 모듈 - 격자(grid) 공간 색인 + 벡터화된 haversine 거리 계산 (prototype/geo.py도 이 모듈을 불러와 씀)
+
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+# 위도 1도에 해당하는 거리 (haversine과 같은 지구 반지름에서 계산해야 격자 칸 경계가 어긋나지 않음)
+METERS_PER_DEGREE_LAT = math.radians(1) * EARTH_RADIUS_M
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """두 지점(또는 배열) 사이의 대원 거리(m)를 계산하는 함수"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GridIndex:
+    """위경도를 cell_m 크기의 격자 칸으로 나누어 두고, 주변 칸의 점만 거리 계산하는 공간 색인"""
+
+    def __init__(self, lats, lons, cell_m=250.0):
+        self.lats = np.asarray(lats, dtype=float)
+        self.lons = np.asarray(lons, dtype=float)
+        self.cell_m = cell_m
+        self.cell_lat = cell_m / METERS_PER_DEGREE_LAT
+        # 위도가 높을수록 경도 1도의 길이가 짧아지므로, 가장 높은 위도 기준으로 칸 너비가 cell_m 이상이 되게 함
+        # 좌표가 없는(NaN) 가게는 색인에서 제외
+        self._valid = np.flatnonzero(np.isfinite(self.lats) & np.isfinite(self.lons))
+        max_abs_lat = float(np.abs(self.lats[self._valid]).max()) if len(self._valid) else 0.0
+        self.cell_lon = cell_m / (METERS_PER_DEGREE_LAT * max(np.cos(np.radians(min(max_abs_lat, 89.0))), 1e-6))
+
+        self._cells = {}
+        if len(self._valid):
+            rows, cols = self._cell_of(self.lats[self._valid], self.lons[self._valid])
+            order = np.lexsort((cols, rows))
+            keys = np.stack([rows[order], cols[order]], axis=1)
+            boundaries = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+            for chunk in np.split(order, boundaries):
+                self._cells[(int(rows[chunk[0]]), int(cols[chunk[0]]))] = self._valid[chunk]
+            cell_keys = np.array(list(self._cells))
+            self._row_range = (cell_keys[:, 0].min(), cell_keys[:, 0].max())
+            self._col_range = (cell_keys[:, 1].min(), cell_keys[:, 1].max())
+
+    def _cell_of(self, lat, lon):
+        return (np.floor(np.asarray(lat) / self.cell_lat).astype('int64'),
+                np.floor(np.asarray(lon) / self.cell_lon).astype('int64'))
+
+    def _max_ring(self, row, col):
+        # 이 칸에서 데이터가 있는 모든 칸을 덮는 데 필요한 최대 고리 수
+        return int(max(abs(row - self._row_range[0]), abs(row - self._row_range[1]),
+                       abs(col - self._col_range[0]), abs(col - self._col_range[1])))
+
+    def _ring_positions(self, row, col, ring):
+        # 중심 칸에서 정확히 ring 칸 떨어진 테두리 칸만 방문
+        if ring == 0:
+            cells = [(row, col)]
+        else:
+            cells = [(row - ring, c) for c in range(col - ring, col + ring + 1)]
+            cells += [(row + ring, c) for c in range(col - ring, col + ring + 1)]
+            cells += [(r, col - ring) for r in range(row - ring + 1, row + ring)]
+            cells += [(r, col + ring) for r in range(row - ring + 1, row + ring)]
+        return [self._cells[cell] for cell in cells if cell in self._cells]
+
+    def _too_wide(self, ring):
+        # 탐색할 칸 수가 데이터가 있는 칸 수보다 많아지면 전체 점을 한 번에 계산하는 편이 빠름
+        return (2 * ring + 1) ** 2 > len(self._cells)
+
+    def _sorted_by_distance(self, lat, lon, candidates, limit=None, radius_m=None):
+        dist = haversine_m(lat, lon, self.lats[candidates], self.lons[candidates])
+        if radius_m is not None:
+            keep = dist <= radius_m
+            candidates, dist = candidates[keep], dist[keep]
+        order = np.argsort(dist, kind='stable')[:limit]
+        return candidates[order], dist[order]
+
+    def within(self, lat, lon, radius_m):
+        """반경 radius_m 안의 점을 (위치 배열, 거리 배열)로 가까운 순서대로 반환"""
+        if not self._cells:
+            return np.array([], dtype='int64'), np.array([])
+        row, col = (int(v) for v in self._cell_of(lat, lon))
+        rings = min(int(np.ceil(radius_m / self.cell_m)), self._max_ring(row, col))
+        if self._too_wide(rings):
+            return self._sorted_by_distance(lat, lon, self._valid, radius_m=radius_m)
+        chunks = []
+        for ring in range(rings + 1):
+            chunks.extend(self._ring_positions(row, col, ring))
+        if not chunks:
+            return np.array([], dtype='int64'), np.array([])
+        return self._sorted_by_distance(lat, lon, np.concatenate(chunks), radius_m=radius_m)
+
+    def nearest(self, lat, lon, k=5, where=None, radius_m=None):
+        """가장 가까운 k개 점을 (위치 배열, 거리 배열)로 반환 - 고리를 한 칸씩 넓혀 가며 탐색
+        where(점마다 True/False인 배열)를 주면 조건을 만족하는 점 중에서, radius_m을 주면 그 반경 안에서만 찾음"""
+        if not self._cells or k <= 0:
+            return np.array([], dtype='int64'), np.array([])
+        row, col = (int(v) for v in self._cell_of(lat, lon))
+        max_ring = self._max_ring(row, col)
+        if radius_m is not None:
+            max_ring = min(max_ring, int(np.ceil(radius_m / self.cell_m)))
+        chunks = []
+        for ring in range(max_ring + 1):
+            if self._too_wide(ring):
+                candidates = self._valid if where is None else self._valid[where[self._valid]]
+                return self._sorted_by_distance(lat, lon, candidates, limit=k, radius_m=radius_m)
+            found = self._ring_positions(row, col, ring)
+            if where is not None:
+                found = [chunk[where[chunk]] for chunk in found]
+            chunks.extend(found)
+            candidates = np.concatenate(chunks) if chunks else np.array([], dtype='int64')
+            if len(candidates) < k and ring < max_ring:
+                continue
+            if not len(candidates):
+                break
+            dist = haversine_m(lat, lon, self.lats[candidates], self.lons[candidates])
+            kth = min(k, len(dist)) - 1
+            # 고리 ring까지 탐색하면 ring * cell_m 이내의 점은 모두 포함되었으므로 k번째 거리가 그 안이면 종료
+            if np.partition(dist, kth)[kth] <= ring * self.cell_m or ring == max_ring:
+                order = np.argsort(dist, kind='stable')[:k]
+                candidates, dist = candidates[order], dist[order]
+                if radius_m is not None:
+                    keep = dist <= radius_m
+                    candidates, dist = candidates[keep], dist[keep]
+                return candidates, dist
+        return np.array([], dtype='int64'), np.array([])
@@ -0,0 +1,93 @@
+# 리뷰 키워드 빈도 인덱스 - 새 리뷰만 토큰화하여 가게별 단어 빈도를 누적
+
+import re
+import threading
+from collections import Counter
+
+# 토큰화 규칙(불용어, 조사/어미, 정규화)을 바꾸면 올려서 이전 규칙으로 만든 워드 클라우드 이미지를 재사용하지 않도록 함
+TOKENIZER_VERSION = 1
+
+# 워드 클라우드/키워드에서 제외할 단어 (정규화 전후 모두 비교)
+STOP_WORDS = {'합니다', '입니다', '했어요', '좋아요', '있습니다', '아니요', '해요', '하세요', '이다', '이예요', '했습니다', '이에요', '않습니다', '같습니다', '아닙니다', '최고', '맛있음'}
+
+# 단어 끝에서 떼어 낼 조사/어미 (긴 것부터 비교)
+SUFFIXES = sorted([
+    '은', '는', '이', '가', '을', '를', '에', '에서', '에게', '한테', '의', '도', '로', '으로', '와', '과', '랑', '이랑',
+    '만', '까지', '부터', '처럼', '보다', '께서',
+    '요', '이에요', '예요', '에요', '이예요', '입니다', '습니다', '합니다', '해요', '했어요', '했습니다', '하고', '해서',
+    '네요', '어요', '아요', '었어요', '았어요', '어서', '아서', '지만', '는데', '다',
+], key=len, reverse=True)
+
+_CLEAN_PATTERN = re.compile(r'[^가-힣a-zA-Z0-9\s]')
+
+
+def normalize_token(token):
+    """단어 끝의 조사/어미를 한 번 떼어 내는 함수 (남는 부분이 2글자 미만이면 그대로 둠)"""
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text):
+    """리뷰 한 건을 정규화된 키워드 목록으로 변환 (불용어, 한 글자 단어 제외)"""
+    tokens = []
+    for raw in _CLEAN_PATTERN.sub(' ', str(text)).split():
+        if raw in STOP_WORDS:
+            continue
+        token = normalize_token(raw.lower())
+        if len(token) >= 2 and token not in STOP_WORDS:
+            tokens.append(token)
+    return tokens
+
+
+class KeywordIndex:
+    """가게별 / 전체 키워드 빈도 인덱스 - 저장소에 새로 추가된 리뷰만 읽어 갱신"""
+
+    def __init__(self):
+        self.by_store = {}
+        self.overall = Counter()
+        # 대상(가게 이름, 전체는 None)별로 빈도가 바뀐 횟수 (리뷰는 추가만 되므로 같은 리뷰 집합이면 같은 값)
+        self.revisions = Counter()
+        self._cursor = 0
+        self._version = None
+        self._lock = threading.Lock()
+
+    def add_review(self, store_name, review):
+        counts = Counter(tokenize(review))
+        if not counts:
+            return
+        self.by_store.setdefault(store_name, Counter()).update(counts)
+        self.overall.update(counts)
+        self.revisions[store_name] += 1
+        self.revisions[None] += 1
+
+    def sync(self, store):
+        """마지막 동기화 이후 추가된 리뷰만 토큰화하여 반영 (리뷰 버전이 같으면 생략)"""
+        version = store.feedback_version()
+        with self._lock:
+            if version == self._version:
+                return
+            feedback, self._cursor = store.read_feedback_after(self._cursor)
+            feedback = feedback.dropna(subset=['store_name', 'review'])
+            for store_name, review in zip(feedback['store_name'], feedback['review']):
+                self.add_review(store_name, review)
+            self._version = version
+
+    def frequencies(self, store_name=None, max_words=100):
+        """워드 클라우드용 {단어: 빈도} (store_name이 없으면 전체 리뷰 기준)"""
+        with self._lock:
+            counter = self.overall if store_name is None else self.by_store.get(store_name, Counter())
+            return dict(counter.most_common(max_words))
+
+    def snapshot(self, store_name=None, max_words=100):
+        """(토큰화 버전, 빈도 변경 횟수)와 그 시점의 {단어: 빈도}를 함께 반환 (워드 클라우드 이미지 캐시 키용)"""
+        with self._lock:
+            counter = self.overall if store_name is None else self.by_store.get(store_name, Counter())
+            return (TOKENIZER_VERSION, self.revisions[store_name]), dict(counter.most_common(max_words))
+
+    def top_keywords(self, store_name=None, n=10):
+        """빈도 상위 n개 키워드를 (단어, 빈도) 목록으로 반환"""
+        with self._lock:
+            counter = self.overall if store_name is None else self.by_store.get(store_name, Counter())
+            return counter.most_common(n)
@@ -0,0 +1,281 @@
+# 페이지 렌더링 부하 테스트 - Streamlit AppTest로 여러 사용자 세션을 동시에 띄워 page_routes 흐름을 반복하고
+# 페이지별 rerun 지연 시간 분위수와 파일 I/O 횟수를 기록
+# 사용법: python load_test.py [--sessions 20] [--rounds 3] [--processes 1] [--app-dir 폴더] [-o load.json]
+#
+# AppTest는 프로세스 전역 Runtime을 쓰기 때문에 한 프로세스 안에서 스레드로 동시에 돌릴 수 없음.
+# 그래서 한 프로세스(= 서버 한 대) 안에서는 세션들을 열어 둔 채 단계를 번갈아 실행하고 (캐시를 공유하는 실제 서버와 같음),
+# 실제 병렬 부하는 --processes로 프로세스(= 서버 복제본)를 늘려서 줌
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from benchmark import DATA_FILE, git_commit, prepare_app_dir
+from storage import FEEDBACK_FILE, LOG_FILE
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ADMIN_PASSWORD = "admin1234"
+ADMIN_BUTTON = "📈 관리자 페이지로 이동"
+# 측정 프로세스가 결과/로그를 남기는 파일 이름 (앱 폴더 안, 프로세스 번호를 붙임)
+WORKER_RESULT = 'load_result_{}.json'
+WORKER_LOG = 'load_worker_{}.log'
+PERCENTILES = (50, 90, 95, 99)
+
+
+class IOCounter:
+    """sys.addaudithook으로 파일 열기/디렉터리 조회/SQLite 연결 횟수를 셈 (한 번 등록하면 해제할 수 없으므로 프로세스당 하나)"""
+
+    def __init__(self, app_dir):
+        self.app_dir = os.path.realpath(app_dir)
+        self.counts = {'open': 0, 'open_write': 0, 'data_open': 0, 'listdir': 0, 'sqlite_connect': 0}
+        sys.addaudithook(self._hook)
+
+    def _hook(self, event, args):
+        if event == 'open':
+            path, mode = args[0], args[1]
+            self.counts['open'] += 1
+            if isinstance(mode, str) and any(flag in mode for flag in 'wax+'):
+                self.counts['open_write'] += 1
+            if isinstance(path, str) and os.path.realpath(path).startswith(self.app_dir):
+                self.counts['data_open'] += 1
+        elif event in ('os.listdir', 'os.scandir'):
+            self.counts['listdir'] += 1
+        elif event == 'sqlite3.connect':
+            self.counts['sqlite_connect'] += 1
+
+    def snapshot(self):
+        return dict(self.counts)
+
+    def since(self, before):
+        return {key: value - before[key] for key, value in self.counts.items()}
+
+
+def user_flow(at, rng, rounds, majors, admin_ratio):
+    """한 사용자의 흐름: 홈 → 대분류 → 소분류 목록 → (목록 페이지 넘김) → 가게 상세 → 홈 (일부는 관리자 페이지까지)
+    다음 동작은 직전 화면을 보고 정해야 하므로 (동작 이름, 실행 함수)를 하나씩 yield 함"""
+    yield 'open', at.run
+    for _ in range(rounds):
+        buttons = [button for button in at.button if button.label in majors]
+        if not buttons:
+            return
+        yield 'click_major', rng.choice(buttons).click().run
+
+        buttons = [button for button in at.button if (button.key or '').startswith('sub_summary_')]
+        if not buttons:
+            return
+        yield 'click_sub', rng.choice(buttons).click().run
+
+        pages = [number for number in at.number_input if (number.key or '').startswith('store_list_page_')]
+        if pages and pages[0].max > 1 and rng.random() < 0.5:
+            yield 'next_list_page', pages[0].set_value(rng.randint(2, pages[0].max)).run
+
+        radios = [radio for radio in at.radio if (radio.key or '').startswith('store_list_radio_')]
+        if not radios or not radios[0].options:
+            return
+        yield 'select_store', radios[0].set_value(rng.choice(radios[0].options)).run
+
+        if rng.random() < admin_ratio:
+            buttons = [button for button in at.button if button.label == ADMIN_BUTTON]
+            if not buttons:
+                return
+            yield 'open_admin', buttons[0].click().run
+            if not at.text_input:
+                return
+            at.text_input[0].input(ADMIN_PASSWORD)
+            yield 'admin_login', [button for button in at.button if button.label == "로그인"][0].click().run
+
+        buttons = [button for button in at.button if button.label.startswith("🏠 홈으로 돌아가기")]
+        if not buttons:
+            return
+        yield 'go_home', buttons[0].click().run
+
+
+def run_worker(app_dir, sessions, rounds, seed, admin_ratio, timeout):
+    """app_dir의 앱에 세션 sessions개를 열어 두고 단계를 무작위 순서로 번갈아 실행하며 rerun마다 시간과 I/O를 기록"""
+    sys.path.insert(0, app_dir)
+    os.chdir(app_dir)
+    from streamlit.testing.v1 import AppTest
+    from catalog import StoreCatalog, load_catalog
+
+    majors = set(StoreCatalog(load_catalog(os.path.join(app_dir, DATA_FILE))).major_categories())
+    counter = IOCounter(app_dir)
+    rng = random.Random(seed)
+    script = os.path.join(app_dir, 'v4.py')
+
+    flows = {}
+    for session_id in range(sessions):
+        at = AppTest.from_file(script, default_timeout=timeout)
+        flows[session_id] = (at, user_flow(at, random.Random(rng.random()), rounds, majors, admin_ratio))
+
+    samples = []
+    cold_start = None
+    while flows:
+        # 매 차례 남은 세션 순서를 섞어서 여러 사용자가 서로 다른 페이지를 번갈아 요청하는 상황을 흉내 냄
+        for session_id in rng.sample(list(flows), len(flows)):
+            at, flow = flows[session_id]
+            try:
+                action, step = next(flow)
+            except StopIteration:
+                del flows[session_id]
+                continue
+
+            before = counter.snapshot()
+            start = time.perf_counter()
+            step()
+            seconds = time.perf_counter() - start
+            io = counter.since(before)
+            page = at.session_state['page'] if 'page' in at.session_state else None
+            errors = [str(exception.message) for exception in at.exception]
+
+            # 프로세스의 첫 rerun은 import와 캐시 생성을 포함하므로 분위수에서 빼고 따로 기록
+            if cold_start is None:
+                cold_start = {'seconds': seconds, 'io': io}
+                continue
+            samples.append({'session': session_id, 'action': action, 'page': page, 'seconds': seconds, 'io': io, 'errors': errors})
+    return {'cold_start': cold_start, 'samples': samples}
+
+
+def summarize(samples):
+    """페이지별 rerun 지연 시간 분위수(ms)와 rerun당 평균 I/O 횟수"""
+    by_page = {}
+    for sample in samples:
+        by_page.setdefault(sample['page'], []).append(sample)
+
+    summary = {}
+    for page, rows in sorted(by_page.items(), key=lambda item: str(item[0])):
+        seconds = np.array([row['seconds'] for row in rows])
+        stats = {'reruns': len(rows), 'errors': sum(bool(row['errors']) for row in rows)}
+        stats.update({f'p{p}_ms': float(np.percentile(seconds, p) * 1000) for p in PERCENTILES})
+        stats['max_ms'] = float(seconds.max() * 1000)
+        stats['mean_ms'] = float(seconds.mean() * 1000)
+        stats['io_per_rerun'] = {key: float(np.mean([row['io'][key] for row in rows])) for key in rows[0]['io']}
+        summary[str(page)] = stats
+    return summary
+
+
+def print_summary(summary, wall_seconds):
+    print(f"\n{'페이지':<22} {'rerun':>6} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}  {'open':>6} {'데이터':>6} {'쓰기':>5} {'오류':>4}", file=sys.stderr)
+    total = 0
+    for page, stats in summary.items():
+        io = stats['io_per_rerun']
+        total += stats['reruns']
+        print(
+            f"{page:<24} {stats['reruns']:>6} "
+            + ' '.join(f"{stats[f'p{p}_ms']:8.1f}" for p in PERCENTILES) + f" {stats['max_ms']:8.1f}  "
+            + f"{io['open']:6.1f} {io['data_open']:6.1f} {io['open_write']:5.1f} {stats['errors']:>4}",
+            file=sys.stderr
+        )
+    if wall_seconds:
+        print(f"\n총 {total} rerun / {wall_seconds:.1f}초 = {total / wall_seconds:.1f} rerun/초 (시간 단위 ms, I/O는 rerun당 평균)", file=sys.stderr)
+
+
+def prepare_load_dir(out_dir):
+    """현재 앱 코드와 데이터를 임시 폴더로 복사 (부하 테스트 중 쌓이는 클릭/리뷰가 실제 데이터에 섞이지 않도록)"""
+    prepare_app_dir(out_dir)
+    for name in (DATA_FILE, FEEDBACK_FILE, LOG_FILE, 'catalog.arrow'):
+        path = os.path.join(BASE_DIR, name)
+        if os.path.exists(path):
+            shutil.copy(path, out_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streamlit AppTest로 여러 세션을 동시에 띄워 페이지별 rerun 지연 시간과 파일 I/O를 측정합니다.")
+    parser.add_argument('--sessions', type=int, default=20, help="프로세스당 동시에 열어 둘 사용자 세션 수")
+    parser.add_argument('--rounds', type=int, default=3, help="세션마다 홈 → 상세 흐름을 반복할 횟수")
+    parser.add_argument('--processes', type=int, default=1, help="동시에 실행할 서버 프로세스 수 (복제본 수)")
+    parser.add_argument('--admin-ratio', type=float, default=0.2, help="흐름 중 관리자 페이지까지 들르는 비율")
+    parser.add_argument('--timeout', type=float, default=60.0, help="rerun 한 번의 최대 시간(초)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--app-dir', help="측정할 앱 폴더 (예: benchmark.py --keep-data로 남긴 합성 데이터 폴더, 없으면 현재 앱을 임시 폴더로 복사)")
+    parser.add_argument('-o', '--output', help="결과 JSON 파일 경로 (없으면 표준 출력)")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--worker-id', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        result = run_worker(args.worker, args.sessions, args.rounds, args.seed + args.worker_id, args.admin_ratio, args.timeout)
+        result['max_rss_bytes'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Linux는 KiB 단위
+        with open(os.path.join(args.worker, WORKER_RESULT.format(args.worker_id)), 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return 0
+
+    app_dir = args.app_dir or tempfile.mkdtemp(prefix='kusis_load_')
+    try:
+        if args.app_dir:
+            if os.path.realpath(app_dir) != os.path.realpath(BASE_DIR):
+                prepare_app_dir(app_dir)
+        else:
+            prepare_load_dir(app_dir)
+        print(f"앱 폴더: {app_dir} / 프로세스 {args.processes} x 세션 {args.sessions} x {args.rounds}회", file=sys.stderr)
+
+        env = dict(os.environ, KUSIS_STORE_BACKEND='sqlite')
+        start = time.perf_counter()
+        procs = []
+        for worker_id in range(args.processes):
+            # 파이프로 받으면 읽지 않는 동안 다른 프로세스가 멈출 수 있으므로 로그는 파일로 남김
+            with open(os.path.join(app_dir, WORKER_LOG.format(worker_id)), 'w', encoding='utf-8') as log:
+                procs.append(subprocess.Popen(
+                    [sys.executable, os.path.abspath(__file__), '--worker', app_dir, '--worker-id', str(worker_id),
+                     '--sessions', str(args.sessions), '--rounds', str(args.rounds), '--seed', str(args.seed),
+                     '--admin-ratio', str(args.admin_ratio), '--timeout', str(args.timeout)],
+                    env=env, stdout=subprocess.DEVNULL, stderr=log, text=True
+                ))
+        workers = []
+        for worker_id, proc in enumerate(procs):
+            if proc.wait() != 0:
+                with open(os.path.join(app_dir, WORKER_LOG.format(worker_id)), encoding='utf-8') as log:
+                    sys.stderr.writelines(log.readlines()[-20:])
+                raise RuntimeError(f"측정 프로세스 {worker_id}가 실패했습니다 (종료 코드 {proc.returncode})")
+            with open(os.path.join(app_dir, WORKER_RESULT.format(worker_id)), encoding='utf-8') as f:
+                workers.append(json.load(f))
+        wall_seconds = time.perf_counter() - start
+    finally:
+        if not args.app_dir:
+            shutil.rmtree(app_dir, ignore_errors=True)
+
+    samples = [sample for worker in workers for sample in worker['samples']]
+    for sample in samples:
+        if sample['errors']:
+            print(f"  ❌ 세션 {sample['session']} {sample['action']} → {sample['page']}: {sample['errors'][0][:200]}", file=sys.stderr)
+    summary = summarize(samples)
+    print_summary(summary, wall_seconds)
+    report = {
+        'meta': {
+            'git_commit': git_commit(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processes': args.processes,
+            'sessions': args.sessions,
+            'rounds': args.rounds,
+            'admin_ratio': args.admin_ratio,
+            'seed': args.seed,
+            'wall_seconds': wall_seconds,
+        },
+        'cold_start': [worker['cold_start'] for worker in workers],
+        'max_rss_bytes': [worker['max_rss_bytes'] for worker in workers],
+        'pages': summary,
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if any(stats['errors'] for stats in summary.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# 지도 레이어 데이터 파이프라인 - 필요한 컬럼만 추출하고, 줌 단계별로 가까운 가게를 묶어(클러스터) 전송량을 줄임
+
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+
+# 지도 레이어와 툴팁에 필요한 컬럼만 사용 (caption, benefit 같은 긴 문자열은 보내지 않음)
+MAP_COLUMNS = ['가게이름', '평균별점', 'lat', 'lon']
+
+# 지도 상세도 -> 초기 줌 (Streamlit은 브라우저의 현재 줌을 서버로 보내지 않으므로 상세도를 직접 선택)
+ZOOM_LEVELS = {'넓게': 13.0, '보통': 14.5, '자세히': 16.0}
+
+# 화면에서 이 픽셀 크기 칸 안에 들어오는 가게들을 하나의 원으로 묶음
+CLUSTER_CELL_PX = 48
+TILE_SIZE = 256
+# 줌 0에서 적도 기준 픽셀당 미터
+METERS_PER_PIXEL_Z0 = 156543.03392
+
+
+def project_mercator(lat, lon):
+    """위경도를 Web Mercator 정규 좌표(0~1)로 변환 (지도 타일과 같은 투영)"""
+    lat = np.clip(np.asarray(lat, dtype=float), -85.05112878, 85.05112878)
+    x = (np.asarray(lon, dtype=float) + 180.0) / 360.0
+    sin_lat = np.sin(np.radians(lat))
+    y = 0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * np.pi)
+    return x, y
+
+
+class MapPointSet:
+    """지도에 표시할 가게 좌표 - 투영 좌표를 미리 계산해 두고 줌 단계별 클러스터를 만들어 재사용"""
+
+    def __init__(self, df):
+        points = df[MAP_COLUMNS].dropna(subset=['lat', 'lon']).reset_index(drop=True)
+        self.names = points['가게이름'].astype(str).to_numpy()
+        self.ratings = points['평균별점'].astype(float).to_numpy()
+        self.lats = points['lat'].to_numpy(dtype=float)
+        self.lons = points['lon'].to_numpy(dtype=float)
+        self.x, self.y = project_mercator(self.lats, self.lons)
+        self._clusters = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def center(self):
+        return float(self.lats.mean()), float(self.lons.mean())
+
+    def clusters(self, zoom, cell_px=CLUSTER_CELL_PX):
+        """줌 zoom에서 cell_px 픽셀 칸마다 가게를 묶은 DataFrame (가게 하나뿐인 칸은 원래 이름 그대로)"""
+        key = (zoom, cell_px)
+        if key not in self._clusters:
+            self._clusters[key] = self._build_clusters(zoom, cell_px)
+        return self._clusters[key]
+
+    def _build_clusters(self, zoom, cell_px):
+        if len(self) == 0:
+            return pd.DataFrame(columns=MAP_COLUMNS + ['count', 'label', 'radius'])
+        cell = cell_px / (TILE_SIZE * 2 ** zoom)
+        cell_x = np.floor(self.x / cell).astype('int64')
+        cell_y = np.floor(self.y / cell).astype('int64')
+        # first: 칸마다 처음 등장한 가게 = 입력 순서(순위)가 가장 높은 가게를 대표 이름으로 사용
+        _, first, inverse = np.unique(cell_x * (1 << 32) + cell_y, return_index=True, return_inverse=True)
+        count = np.bincount(inverse)
+        rating = np.bincount(inverse, weights=self.ratings) / count
+
+        names = self.names[first]
+        label = np.where(count > 1, count.astype(str), '')
+        name = np.where(count > 1, [f"{n} 외 {c - 1}곳" for n, c in zip(names, count)], names)
+        # 원 반지름(m)은 묶인 가게 수에 따라 키우되, 이웃 칸과 겹치지 않도록 칸 크기의 절반으로 제한
+        cell_m = cell_px * METERS_PER_PIXEL_Z0 * np.cos(np.radians(self.lats.mean())) / 2 ** zoom
+        radius = np.minimum(50 * np.sqrt(count), max(50.0, cell_m / 2))
+        order = np.argsort(first, kind='stable')
+        return pd.DataFrame({
+            '가게이름': name[order],
+            '평균별점': np.round(rating[order], 1),
+            'lat': (np.bincount(inverse, weights=self.lats) / count)[order],
+            'lon': (np.bincount(inverse, weights=self.lons) / count)[order],
+            'count': count[order],
+            'label': label[order],
+            'radius': radius[order].round(1),
+        })
+
+
+class CachedDeck(pdk.Deck):
+    """JSON 직렬화 결과를 한 번만 만들어 두는 Deck (같은 지도를 다시 그릴 때 직렬화 생략)"""
+
+    def to_json(self):
+        if getattr(self, '_cached_json', None) is None:
+            self._cached_json = super().to_json()
+        return self._cached_json
+
+
+def build_store_map(points, zoom, extra_layers=(), color=(2, 117, 41, 200)):
+    """클러스터 ScatterplotLayer + 묶인 가게 수 TextLayer로 구성된 지도를 만들고 JSON을 미리 직렬화"""
+    clustered = points.clusters(zoom)
+    records = clustered.to_dict(orient='records')
+    center_lat, center_lon = points.center()
+
+    layers = [
+        pdk.Layer(
+            'ScatterplotLayer', data=records, get_position='[lon, lat]',
+            get_color=list(color), get_radius='radius', pickable=True, auto_highlight=True
+        ),
+        pdk.Layer(
+            'TextLayer', data=[r for r in records if r['count'] > 1], get_position='[lon, lat]',
+            get_text='label', get_size=14, get_color=[255, 255, 255, 255],
+            get_text_anchor="'middle'", get_alignment_baseline="'center'"
+        ),
+    ]
+    layers.extend(extra_layers)
+
+    tooltip = {"html": "<b>{가게이름}</b><br/>⭐ {평균별점}", "style": {"backgroundColor": "#027529", "color": "white"}}
+    deck = CachedDeck(
+        layers=layers,
+        initial_view_state=pdk.ViewState(latitude=center_lat, longitude=center_lon, zoom=zoom, pitch=20),
+        map_style='light', tooltip=tooltip
+    )
+    deck.to_json()
+    return deck
@@ -0,0 +1,75 @@
+# 시작(콜드 스타트) 시간 측정 모듈 - KUSIS_PROFILE=1 일 때만 동작
+# 모듈 단위 import 시간과 페이지별 첫 렌더링 시간을 프로세스 전체에서 한 번씩 기록
+
+import builtins
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+ENABLED = os.environ.get('KUSIS_PROFILE', '') not in ('', '0')
+# 시작 시간 예산 (초) - import 시간과 첫 렌더링 시간의 합이 이 값을 넘으면 경고
+BUDGET_SECONDS = float(os.environ.get('KUSIS_STARTUP_BUDGET', '3.0'))
+
+records = []  # (종류, 이름, 초)
+_seen = set()
+_lock = threading.Lock()
+_local = threading.local()
+_original_import = builtins.__import__
+
+
+def _record(kind, name, seconds):
+    with _lock:
+        if (kind, name) in _seen:
+            return
+        _seen.add((kind, name))
+        records.append((kind, name, seconds))
+    print(f"[KUSIS profile] {kind:<6} {name:<32} {seconds * 1000:8.1f} ms", file=sys.stderr)
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # 아직 로드되지 않은 최상위 모듈의 import만 측정 (중첩 import 시간은 바깥 모듈에 포함)
+    depth = getattr(_local, 'depth', 0)
+    top_name = name.partition('.')[0]
+    if depth or level or top_name in sys.modules:
+        _local.depth = depth + 1
+        try:
+            return _original_import(name, globals, locals, fromlist, level)
+        finally:
+            _local.depth = depth
+    _local.depth = 1
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _local.depth = 0
+        _record('import', top_name, time.perf_counter() - start)
+
+
+def install_import_timer():
+    """프로파일 모드일 때 import 시간을 기록하도록 __import__를 감쌈 (한 번만 설치)"""
+    if ENABLED and builtins.__import__ is not _timed_import:
+        builtins.__import__ = _timed_import
+
+
+@contextmanager
+def measure_first(kind, name):
+    """블록의 실행 시간을 (kind, name)별 첫 실행에 한해 기록"""
+    if not ENABLED or (kind, name) in _seen:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(kind, name, time.perf_counter() - start)
+
+
+def total_seconds():
+    with _lock:
+        return sum(seconds for _, _, seconds in records)
+
+
+def over_budget():
+    return ENABLED and total_seconds() > BUDGET_SECONDS
@@ -0,0 +1,101 @@
+# 추천 순위 계산 모듈 (데이터 버전마다 한 번만 계산해 두고 각 페이지에서 읽기만 함)
+
+import numpy as np
+
+# Rank_Score = (평균 별점 * 10) + (총 리뷰 수 * 1) + (총 조회 수 * 0.05)
+DEFAULT_WEIGHTS = {'평균별점': 10.0, '리뷰수': 1.0, '조회수': 0.05}
+
+
+def compute_rank_score(df, weights=None):
+    """가중치를 적용한 Rank_Score 배열을 계산하는 함수"""
+    weights = weights or DEFAULT_WEIGHTS
+    score = np.zeros(len(df), dtype=float)
+    for column, weight in weights.items():
+        score += df[column].to_numpy(dtype=float) * weight
+    return score
+
+
+def top_k(scores, k, positions=None):
+    """점수가 높은 상위 k개의 위치를 점수 내림차순으로 반환 (전체 정렬 없이 argpartition 사용)"""
+    if positions is None:
+        positions = np.arange(len(scores))
+    k = min(k, len(positions))
+    if k <= 0:
+        return positions[:0]
+    sub_scores = scores[positions]
+    if k < len(positions):
+        chosen = np.argpartition(-sub_scores, k - 1)[:k]
+    else:
+        chosen = np.arange(len(positions))
+    # 동점이면 원래 순서를 유지하도록 위치를 보조 키로 사용
+    order = np.lexsort((positions[chosen], -sub_scores[chosen]))
+    return positions[chosen[order]]
+
+
+class RankingEngine:
+    """전체/대분류별 추천 Top-k와 소분류별 조회수 순 목록을 미리 계산해 두는 클래스"""
+
+    def __init__(self, df, weights=None, k=10):
+        self.df = df.reset_index(drop=True)
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.k = k
+        self.scores = compute_rank_score(self.df, self.weights)
+
+        self._top_global = top_k(self.scores, k)
+        self._top_by_major = {}
+        self._list_by_sub = {}
+        if self.df.empty:
+            return
+
+        for major, positions in self.df.groupby('카테고리(대)', sort=False, observed=True).indices.items():
+            self._top_by_major[major] = top_k(self.scores, k, positions)
+
+        # 소분류 목록은 (조회수, 리뷰수) 내림차순 - 한 번의 lexsort 후 소분류별로 나눔
+        views = self.df['조회수'].to_numpy()
+        reviews = self.df['리뷰수'].to_numpy()
+        order = np.lexsort((np.arange(len(self.df)), -reviews, -views))
+        sorted_subs = self.df['카테고리(중)'].iloc[order].reset_index(drop=True)
+        for sub, idx in sorted_subs.groupby(sorted_subs, sort=False, observed=True).indices.items():
+            self._list_by_sub[sub] = order[idx]
+
+    def _rows(self, positions):
+        rows = self.df.iloc[positions].copy()
+        rows['Rank_Score'] = self.scores[positions]
+        return rows
+
+    def top_stores(self, k=3, major=None):
+        """Rank_Score 기준 상위 k개 가게 (major 지정 시 해당 대분류 안에서)"""
+        positions = self._top_global if major is None else self._top_by_major.get(major, self._top_global[:0])
+        if k > self.k:
+            # 미리 계산한 개수보다 많이 요청하면 그때만 다시 계산
+            base = None if major is None else self.df.index[self.df['카테고리(대)'] == major].to_numpy()
+            positions = top_k(self.scores, k, base)
+        return self._rows(positions[:k])
+
+    def store_list(self, sub_category):
+        """소분류 내 전체 가게를 조회수, 리뷰수 순으로 반환"""
+        positions = self._list_by_sub.get(sub_category, self._top_global[:0])
+        return self._rows(positions)
+
+    def store_count(self, sub_category):
+        return len(self._list_by_sub.get(sub_category, ()))
+
+    def store_page(self, sub_category, offset, limit):
+        """소분류 목록 중 [offset, offset + limit) 구간만 잘라서 반환 (페이지 크기만큼만 복사)"""
+        positions = self._list_by_sub.get(sub_category, self._top_global[:0])
+        return self._rows(positions[offset:offset + limit])
+
+    def store_rank(self, sub_category, store_name):
+        """소분류 목록에서 가게의 위치(0부터)를 반환 (없으면 None)"""
+        positions = self._list_by_sub.get(sub_category, self._top_global[:0])
+        found = np.flatnonzero(self.df['가게이름'].to_numpy()[positions] == store_name)
+        return int(found[0]) if len(found) else None
+
+    def top_by_scores(self, scores, k=3):
+        """외부에서 계산한 점수(가게 이름 → 점수, 예: 트렌딩)로 상위 k개 가게를 반환 (점수 0은 제외)"""
+        values = scores.reindex(self.df['가게이름']).fillna(0.0).to_numpy(dtype=float)
+        positions = top_k(values, k)
+        positions = positions[values[positions] > 0]
+        rows = self.df.iloc[positions].copy()
+        rows['Trend_Score'] = values[positions]
+        return rows
@@ -0,0 +1,42 @@
+# 리뷰 데이터 인덱스 (가게별 리뷰를 정렬된 구간으로 미리 나누어 둠)
+
+import numpy as np
+
+
+class FeedbackIndex:
+    """가게 이름 → 리뷰 행 구간(slice) 인덱스 - 정렬은 생성 시 한 번만 수행"""
+
+    def __init__(self, feedback_df):
+        df = feedback_df.dropna(subset=['store_name'])
+        # 가게 이름 순, 같은 가게 안에서는 최신 리뷰가 먼저 오도록 정렬
+        self.frame = df.sort_values(['store_name', 'timestamp'], ascending=[True, False], kind='stable').reset_index(drop=True)
+        # 관리자 '전체 보기'용 최신순 전체 리뷰
+        self.by_time = df.sort_values('timestamp', ascending=False, kind='stable').reset_index(drop=True)
+
+        names = self.frame['store_name'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]]) if len(names) else np.array([], dtype=int)
+        ends = np.r_[starts[1:], len(names)]
+        self._slices = {names[s]: (s, e) for s, e in zip(starts, ends)}
+        self._store_names = sorted(self._slices)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def reviews_for(self, store_name, limit=None):
+        """특정 가게의 리뷰를 최신순으로 반환 (limit 지정 시 앞에서부터 limit개)"""
+        start, end = self._slices.get(store_name, (0, 0))
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.frame.iloc[start:end]
+
+    def review_count(self, store_name):
+        start, end = self._slices.get(store_name, (0, 0))
+        return end - start
+
+    def store_names(self):
+        """리뷰가 있는 가게 이름 목록 (정렬됨)"""
+        return self._store_names
+
+    def latest(self, limit=None):
+        """전체 리뷰를 최신순으로 반환"""
+        return self.by_time if limit is None else self.by_time.head(limit)
@@ -0,0 +1,98 @@
+# 가게/혜택 검색 모듈 - 한글 글자 n-gram 역색인 (가게 데이터 파일 버전마다 한 번 생성, 순위 점수는 검색할 때 반영)
+
+import re
+
+import numpy as np
+
+from ranking import top_k
+
+# 검색 대상 컬럼과 가중치 (가게 이름 일치를 더 높게 평가)
+SEARCH_FIELDS = {'가게이름': 3.0, 'benefit': 1.0, 'caption': 1.0, '주소': 1.0}
+
+_CLEAN_PATTERN = re.compile(r'[^가-힣a-zA-Z0-9]')
+
+
+def char_ngrams(text, n=2):
+    """공백/기호를 제거한 뒤 글자 n-gram 집합을 반환 (n보다 짧으면 글자 그대로)"""
+    text = _CLEAN_PATTERN.sub('', str(text).lower())
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class SearchIndex:
+    """가게 DataFrame에 대한 n-gram 역색인 - 검색할 때 넘겨받은 Rank_Score를 검색 점수에 섞어 정렬"""
+
+    def __init__(self, df, fields=None, n=2):
+        self.df = df.reset_index(drop=True)
+        self.n = n
+        fields = fields or SEARCH_FIELDS
+        self.fields = {column: weight for column, weight in fields.items() if column in self.df.columns}
+        postings = {}
+        for column, weight in self.fields.items():
+            for doc_id, value in enumerate(self.df[column].tolist()):
+                if value is None or value != value:  # NaN 제외
+                    continue
+                for gram in char_ngrams(value, n):
+                    doc_weights = postings.setdefault(gram, {})
+                    # 같은 n-gram이 여러 컬럼에 있으면 가장 높은 컬럼 가중치만 사용
+                    doc_weights[doc_id] = max(doc_weights.get(doc_id, 0.0), weight)
+
+        num_docs = max(len(self.df), 1)
+        self._postings = {}
+        for gram, doc_weights in postings.items():
+            idf = np.log1p(num_docs / len(doc_weights))
+            ids = np.fromiter(doc_weights.keys(), dtype='int64', count=len(doc_weights))
+            weights = np.fromiter(doc_weights.values(), dtype=float, count=len(doc_weights)) * idf
+            self._postings[gram] = (ids, weights)
+
+    def search(self, query, limit=10, rank_scores=None, frame=None, rank_weight=0.2, min_coverage=0.5):
+        """검색어와 n-gram이 겹치는 가게를 (검색 점수 + rank_weight * 정규화된 Rank_Score) 순으로 반환
+        rank_scores/frame은 색인과 같은 행 순서의 현재 순위 점수/가게 DataFrame (frame이 없으면 색인 생성 시점의 행을 반환)"""
+        frame = self.df if frame is None else frame
+        text = _CLEAN_PATTERN.sub('', str(query).lower())
+        if 0 < len(text) < self.n:
+            # n-gram보다 짧은 검색어(예: '빵', '술')는 색인에 없으므로 검색 대상 컬럼에서 직접 부분 문자열로 찾음
+            candidates, text_score = self._substring_matches(text)
+            return self._ranked(candidates, text_score, limit, rank_scores, frame, rank_weight)
+
+        grams = [g for g in char_ngrams(query, self.n) if g in self._postings]
+        query_size = len(char_ngrams(query, self.n))
+        if not grams:
+            return frame.iloc[:0].assign(Search_Score=[])
+
+        # 검색어에 포함된 n-gram의 posting만 모아서 후보 문서별 점수를 합산
+        ids = np.concatenate([self._postings[g][0] for g in grams])
+        weights = np.concatenate([self._postings[g][1] for g in grams])
+        candidates, inverse = np.unique(ids, return_inverse=True)
+        text_score = np.bincount(inverse, weights=weights)
+        matched = np.bincount(inverse)
+
+        # 검색어 n-gram의 일정 비율 이상이 일치한 후보만 남김
+        keep = matched >= np.ceil(query_size * min_coverage)
+        return self._ranked(candidates[keep], text_score[keep], limit, rank_scores, frame, rank_weight)
+
+    def _substring_matches(self, text):
+        # 검색어가 들어 있는 컬럼 중 가장 높은 컬럼 가중치를 문서 점수로 사용 (컬럼 단위 벡터 연산)
+        best = np.zeros(len(self.df))
+        for column, weight in self.fields.items():
+            found = self.df[column].astype('string').str.lower().str.contains(text, regex=False)
+            best = np.maximum(best, np.where(found.fillna(False).to_numpy(dtype=bool), weight, 0.0))
+        candidates = np.flatnonzero(best)
+        return candidates, best[candidates]
+
+    def _ranked(self, candidates, text_score, limit, rank_scores, frame, rank_weight):
+        # 후보 문서를 (정규화된 검색 점수 + rank_weight * 정규화된 Rank_Score) 순으로 limit개 반환
+        if len(candidates) == 0:
+            return frame.iloc[:0].assign(Search_Score=[])
+
+        score = text_score / text_score.max()
+        if rank_scores is not None and len(rank_scores):
+            rank_scores = np.asarray(rank_scores, dtype=float)
+            top = rank_scores.max()
+            if top > 0:
+                score = score + rank_weight * rank_scores[candidates] / top
+        best = top_k(score, limit)
+        rows = frame.iloc[candidates[best]].copy()
+        rows['Search_Score'] = score[best]
+        return rows
@@ -0,0 +1,465 @@
+# 클릭 로그 / 피드백 저장소 (기본: SQLite WAL, 보조: CSV)
+
+import abc
+import csv              # CSV 백엔드 기록 및 내보내기용
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+CLICK_COLUMNS = ['timestamp', 'type', 'value']
+FEEDBACK_COLUMNS = ['timestamp', 'store_name', 'rating', 'review']
+
+DB_FILE = 'kusis.db'
+LOG_FILE = 'click_log.csv'
+FEEDBACK_FILE = 'feedback.csv'
+
+# 환경 변수로 백엔드를 바꿀 수 있도록 함 ('sqlite' 또는 'csv')
+BACKEND_ENV = 'KUSIS_STORE_BACKEND'
+
+
+def read_feedback_csv(path):
+    """BOM/헤더 문제를 피하기 위해 컬럼을 강제로 지정하여 피드백 CSV를 읽는 함수"""
+    try:
+        df = pd.read_csv(path, engine='python', encoding='utf-8-sig', header=None, skiprows=1)
+        df.columns = FEEDBACK_COLUMNS
+        df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
+        return df
+    except Exception:
+        return pd.DataFrame(columns=FEEDBACK_COLUMNS)
+
+
+def file_version(path):
+    """파일의 (수정 시각, 크기)를 버전으로 반환하는 함수 (파일이 없으면 None)"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def read_click_csv(path):
+    """클릭 로그 CSV를 읽는 함수 (파일이 없으면 빈 DataFrame)"""
+    try:
+        return pd.read_csv(path)
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return pd.DataFrame(columns=CLICK_COLUMNS)
+
+
+STORE_STATS_COLUMNS = ['store_name', 'rating_sum', 'rating_count', 'view_count', 'last_updated']
+
+
+def compute_store_stats(feedback_df, click_df):
+    """피드백/클릭 로그 전체에서 가게별 통계를 계산하는 함수 (CSV 백엔드 및 재구축용)"""
+    rated = feedback_df.dropna(subset=['store_name'])
+    views = click_df[click_df['type'] == 'store_view'].dropna(subset=['value'])
+    stats = pd.DataFrame({
+        'rating_sum': rated.groupby('store_name')['rating'].sum(),
+        'rating_count': rated.groupby('store_name')['rating'].count(),
+        'view_count': views.groupby('value').size(),
+    })
+    last_updated = pd.concat([
+        rated.groupby('store_name')['timestamp'].max(),
+        views.groupby('value')['timestamp'].max(),
+    ]).astype(str)
+    stats['last_updated'] = last_updated.groupby(level=0).max()
+    stats['rating_sum'] = stats['rating_sum'].fillna(0.0)
+    stats['rating_count'] = stats['rating_count'].fillna(0).astype(int)
+    stats['view_count'] = stats['view_count'].fillna(0).astype(int)
+    stats.index.name = 'store_name'
+    return stats.reset_index()[STORE_STATS_COLUMNS]
+
+
+class EventStore(abc.ABC):
+    """클릭/피드백 저장소 공통 인터페이스"""
+
+    def append_click(self, log_type, value, timestamp=None):
+        self.append_clicks([(timestamp or datetime.now(), log_type, value)])
+
+    @abc.abstractmethod
+    def append_clicks(self, rows):
+        """클릭 로그 여러 건을 기록하고, 기록한 행 바로 뒤의 cursor(read_clicks_after 기준)를 반환 (알 수 없으면 None)"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def append_feedback(self, store_name, rating, review, timestamp=None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def read_clicks(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def read_feedback(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def data_version(self):
+        """데이터가 바뀔 때마다 달라지는 버전 값을 반환"""
+        raise NotImplementedError
+
+    def click_version(self):
+        return self.data_version()[0]
+
+    def feedback_version(self):
+        return self.data_version()[1]
+
+    def stats_version(self):
+        """가게별 통계(read_store_stats)가 바뀔 때만 달라지는 버전 값을 반환 (기본: 전체 데이터 버전)"""
+        return self.data_version()
+
+    def read_clicks_after(self, cursor=0, since=None, log_type=None):
+        """cursor 이후에 추가된 클릭 로그와 다음 cursor를 반환 (기본: 행 번호를 cursor로 사용)"""
+        df = self.read_clicks()
+        rows = df.iloc[cursor:]
+        if log_type is not None:
+            rows = rows[rows['type'] == log_type]
+        if since is not None:
+            rows = rows[rows['timestamp'].astype(str) >= str(since)]
+        return rows.reset_index(drop=True), len(df)
+
+    def iter_clicks_after(self, cursor=0, chunksize=100000):
+        """cursor 이후의 클릭 로그를 (DataFrame, 다음 cursor) 단위로 나누어 반환 (기본: 한 번에 반환)"""
+        rows, cursor = self.read_clicks_after(cursor)
+        if len(rows):
+            yield rows, cursor
+
+    def read_clicks_page(self, offset=0, limit=100):
+        """최신순 클릭 로그 중 offset부터 limit개만 반환 (기본: 전체를 읽은 뒤 자름)"""
+        df = self.read_clicks()
+        return df.iloc[::-1].iloc[offset:offset + limit].reset_index(drop=True)
+
+    def read_feedback_after(self, cursor=0, since=None):
+        """cursor 이후에 추가된 피드백과 다음 cursor를 반환 (기본: 행 번호를 cursor로 사용)"""
+        df = self.read_feedback()
+        rows = df.iloc[cursor:]
+        if since is not None:
+            rows = rows[rows['timestamp'].astype(str) >= str(since)]
+        return rows.reset_index(drop=True), len(df)
+
+    def read_store_stats(self):
+        """가게별 통계(별점 합계/개수, 조회수, 마지막 갱신 시각)를 반환 (기본: 전체 로그에서 계산)"""
+        return compute_store_stats(self.read_feedback(), self.read_clicks())
+
+    def export_csv(self, click_path=None, feedback_path=None):
+        """저장된 데이터를 CSV 파일로 내보내는 함수"""
+        if click_path:
+            self.read_clicks().to_csv(click_path, index=False)
+        if feedback_path:
+            self.read_feedback().to_csv(feedback_path, index=False)
+
+
+class SQLiteEventStore(EventStore):
+    """SQLite(WAL 모드) 기반 저장소 - 세션 간 동시 기록에도 행이 섞이지 않음"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # Streamlit 세션은 서로 다른 스레드에서 실행되므로 연결을 공유하고 락으로 보호
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS clicks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    value TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_clicks_type_value ON clicks(type, value);
+                CREATE INDEX IF NOT EXISTS idx_clicks_timestamp ON clicks(timestamp);
+
+                CREATE TABLE IF NOT EXISTS feedback (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    store_name TEXT,
+                    rating REAL,
+                    review TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_feedback_store ON feedback(store_name, timestamp);
+
+                -- 가게별 통계를 미리 집계해 두는 테이블 (기록 시 함께 갱신)
+                CREATE TABLE IF NOT EXISTS store_stats (
+                    store_name TEXT PRIMARY KEY,
+                    rating_sum REAL NOT NULL DEFAULT 0,
+                    rating_count INTEGER NOT NULL DEFAULT 0,
+                    view_count INTEGER NOT NULL DEFAULT 0,
+                    last_updated TEXT
+                );
+
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+        # store_stats가 없던 이전 DB는 기존 로그로 한 번 채워 둠
+        if not self.get_meta('store_stats_built'):
+            self.rebuild_store_stats()
+
+    def get_meta(self, key):
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value)))
+
+    # --- 내부 기록 함수: 호출하는 쪽에서 락과 트랜잭션을 잡고 있어야 함 ---
+    def _insert_clicks(self, rows):
+        self._conn.executemany('INSERT INTO clicks (timestamp, type, value) VALUES (?, ?, ?)', rows)
+        # 가게 조회 로그는 가게별로 묶어서 store_stats에 바로 반영 (전체 로그 재집계 불필요)
+        views = {}
+        for ts, log_type, value in rows:
+            if log_type == 'store_view' and value is not None:
+                count, last = views.get(value, (0, ts))
+                views[value] = (count + 1, max(last, ts))
+        self._conn.executemany("""
+            INSERT INTO store_stats (store_name, rating_sum, rating_count, view_count, last_updated)
+            VALUES (?, 0, 0, ?, ?)
+            ON CONFLICT(store_name) DO UPDATE SET
+                view_count = view_count + excluded.view_count,
+                last_updated = max(last_updated, excluded.last_updated)
+        """, [(name, count, last) for name, (count, last) in views.items()])
+        if views:
+            # 통계 버전용 가게 조회 카운터 (다른 유형의 클릭은 store_stats를 바꾸지 않으므로 세지 않음)
+            self._conn.execute("""
+                INSERT INTO meta (key, value) VALUES ('store_view_seq', ?)
+                ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + excluded.value
+            """, (sum(count for count, _ in views.values()),))
+
+    def _insert_feedback(self, rows):
+        self._conn.executemany('INSERT INTO feedback (timestamp, store_name, rating, review) VALUES (?, ?, ?, ?)', rows)
+        self._conn.executemany("""
+            INSERT INTO store_stats (store_name, rating_sum, rating_count, view_count, last_updated)
+            VALUES (?, ?, ?, 0, ?)
+            ON CONFLICT(store_name) DO UPDATE SET
+                rating_sum = rating_sum + excluded.rating_sum,
+                rating_count = rating_count + excluded.rating_count,
+                last_updated = max(last_updated, excluded.last_updated)
+        """, [
+            (store, rating or 0.0, 0 if rating is None else 1, ts)
+            for ts, store, rating, review in rows if store is not None
+        ])
+
+    def append_clicks(self, rows):
+        rows = [(str(ts), log_type, value) for ts, log_type, value in rows]
+        with self._lock, self._conn:
+            self._insert_clicks(rows)
+            # 쓰기 트랜잭션 안에서는 다른 기록이 끼어들 수 없으므로 방금 기록한 행은 (seq - len(rows), seq] 범위
+            row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'clicks'").fetchone()
+        return row[0] if row else 0
+
+    def append_feedback(self, store_name, rating, review, timestamp=None):
+        row = (str(timestamp or datetime.now()), store_name, None if rating is None else float(rating), review)
+        with self._lock, self._conn:
+            self._insert_feedback([row])
+
+    def read_clicks(self):
+        with self._lock:
+            return pd.read_sql_query('SELECT timestamp, type, value FROM clicks ORDER BY id', self._conn)
+
+    def read_feedback(self):
+        with self._lock:
+            df = pd.read_sql_query('SELECT timestamp, store_name, rating, review FROM feedback ORDER BY id', self._conn)
+        df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
+        return df
+
+    def _read_after(self, table, columns, cursor, since, extra_where='', extra_params=()):
+        # 기본 키(id)가 cursor보다 큰 행만 읽으므로 새로 추가된 행 수에 비례한 비용만 듦
+        with self._lock:
+            # 커밋된 시퀀스를 먼저 읽고 그 이하만 조회해야 다른 프로세스의 기록을 건너뛰지 않음
+            row = self._conn.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,)).fetchone()
+            last_id = row[0] if row else 0
+            where = 'id > ? AND id <= ?' + extra_where
+            params = [cursor, last_id, *extra_params]
+            if since is not None:
+                where += ' AND timestamp >= ?'
+                params.append(str(since))
+            df = pd.read_sql_query(f'SELECT {columns} FROM {table} WHERE {where} ORDER BY id', self._conn, params=params)
+        return df, max(cursor, last_id)
+
+    def read_clicks_after(self, cursor=0, since=None, log_type=None):
+        if log_type is None:
+            return self._read_after('clicks', 'timestamp, type, value', cursor, since)
+        return self._read_after('clicks', 'timestamp, type, value', cursor, since, ' AND type = ?', (log_type,))
+
+    def iter_clicks_after(self, cursor=0, chunksize=100000):
+        with self._lock:
+            row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'clicks'").fetchone()
+        last_id = row[0] if row else 0
+        while cursor < last_id:
+            # 청크마다 락을 풀어 주어 긴 집계 중에도 클릭 기록이 막히지 않도록 함
+            with self._lock:
+                df = pd.read_sql_query(
+                    'SELECT id, timestamp, type, value FROM clicks WHERE id > ? AND id <= ? ORDER BY id LIMIT ?',
+                    self._conn, params=[cursor, last_id, chunksize])
+            if df.empty:
+                break
+            cursor = int(df['id'].iloc[-1])
+            yield df.drop(columns='id'), cursor
+
+    def read_clicks_page(self, offset=0, limit=100):
+        # timestamp 인덱스를 역순으로 따라가므로 요청한 페이지 근처만 읽음
+        with self._lock:
+            return pd.read_sql_query(
+                'SELECT timestamp, type, value FROM clicks ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?',
+                self._conn, params=[limit, offset])
+
+    def read_feedback_after(self, cursor=0, since=None):
+        df, cursor = self._read_after('feedback', 'timestamp, store_name, rating, review', cursor, since)
+        df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
+        return df, cursor
+
+    def read_store_stats(self):
+        with self._lock:
+            return pd.read_sql_query(f"SELECT {', '.join(STORE_STATS_COLUMNS)} FROM store_stats", self._conn)
+
+    def rebuild_store_stats(self):
+        """clicks/feedback 테이블 전체에서 store_stats를 다시 만드는 함수 (초기 구축 및 복구용)"""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM store_stats')
+            self._conn.execute("""
+                INSERT INTO store_stats (store_name, rating_sum, rating_count, view_count, last_updated)
+                SELECT store_name, SUM(rating_sum), SUM(rating_count), SUM(view_count), MAX(last_updated) FROM (
+                    SELECT store_name, COALESCE(SUM(rating), 0) AS rating_sum, COUNT(rating) AS rating_count,
+                           0 AS view_count, MAX(timestamp) AS last_updated
+                    FROM feedback WHERE store_name IS NOT NULL GROUP BY store_name
+                    UNION ALL
+                    SELECT value, 0, 0, COUNT(*), MAX(timestamp)
+                    FROM clicks WHERE type = 'store_view' AND value IS NOT NULL GROUP BY value
+                ) GROUP BY store_name
+            """)
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('store_stats_built', ?)", (str(datetime.now()),))
+
+    def _feedback_rows_from_csv(self, path):
+        df = read_feedback_csv(path).dropna(subset=['timestamp', 'store_name'])
+        return [
+            (str(ts), store, None if pd.isna(rating) else float(rating), None if pd.isna(review) else str(review))
+            for ts, store, rating, review in df[FEEDBACK_COLUMNS].itertuples(index=False)
+        ]
+
+    def _click_rows_from_csv(self, path):
+        df = read_click_csv(path).dropna(subset=['timestamp', 'type'])
+        return [(str(ts), log_type, value) for ts, log_type, value in df[CLICK_COLUMNS].itertuples(index=False)]
+
+    def data_version(self):
+        # AUTOINCREMENT 시퀀스는 행이 추가될 때마다 증가하므로 테이블 스캔 없이 버전으로 사용
+        with self._lock:
+            rows = self._conn.execute('SELECT name, seq FROM sqlite_sequence').fetchall()
+        seq = dict(rows)
+        return (seq.get('clicks', 0), seq.get('feedback', 0))
+
+    def stats_version(self):
+        # 리뷰 시퀀스 + 가게 조회 카운터 + 재구축 시각 (검색/선택 등 다른 클릭으로는 바뀌지 않음)
+        with self._lock:
+            feedback = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'feedback'").fetchone()
+            meta = dict(self._conn.execute(
+                "SELECT key, value FROM meta WHERE key IN ('store_view_seq', 'store_stats_built')"
+            ).fetchall())
+        return (feedback[0] if feedback else 0, meta.get('store_view_seq'), meta.get('store_stats_built'))
+
+    def import_feedback_csv(self, path):
+        """CSV 파일의 피드백을 feedback 테이블로 가져오는 함수 (가져온 행 수 반환)"""
+        rows = self._feedback_rows_from_csv(path)
+        with self._lock, self._conn:
+            self._insert_feedback(rows)
+        return len(rows)
+
+    def import_click_csv(self, path):
+        """CSV 파일의 클릭 로그를 clicks 테이블로 가져오는 함수 (가져온 행 수 반환)"""
+        rows = self._click_rows_from_csv(path)
+        with self._lock, self._conn:
+            self._insert_clicks(rows)
+        return len(rows)
+
+    def migrate_from_csv(self, feedback_path, click_path=None):
+        """최초 1회만 기존 CSV 파일을 DB로 옮기는 함수 (meta 테이블에 완료 여부 기록)"""
+        if self.get_meta('csv_migrated'):
+            return
+        feedback_rows = self._feedback_rows_from_csv(feedback_path) if feedback_path and os.path.exists(feedback_path) else []
+        click_rows = self._click_rows_from_csv(click_path) if click_path and os.path.exists(click_path) else []
+        with self._lock, self._conn:
+            # 여러 프로세스가 동시에 시작해도 한 번만 이관되도록 쓰기 잠금을 먼저 잡고 다시 확인
+            self._conn.execute('BEGIN IMMEDIATE')
+            if self._conn.execute("SELECT 1 FROM meta WHERE key = 'csv_migrated'").fetchone():
+                return
+            self._insert_feedback(feedback_rows)
+            self._insert_clicks(click_rows)
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('csv_migrated', ?)", (str(datetime.now()),))
+
+
+class CSVEventStore(EventStore):
+    """기존 CSV 추가 기록 방식 백엔드 (가져오기/내보내기 및 호환용)"""
+
+    def __init__(self, click_path, feedback_path):
+        self.click_path = click_path
+        self.feedback_path = feedback_path
+        self._lock = threading.Lock()
+
+    def _append_rows(self, path, columns, rows):
+        # 같은 프로세스 내 세션끼리 행이 섞이지 않도록 락 안에서 한 번에 기록
+        with self._lock:
+            is_new = not os.path.exists(path)
+            with open(path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                if is_new:
+                    writer.writerow(columns)
+                writer.writerows(rows)
+
+    def append_clicks(self, rows):
+        self._append_rows(self.click_path, CLICK_COLUMNS, [(str(ts), t, v) for ts, t, v in rows])
+
+    def append_feedback(self, store_name, rating, review, timestamp=None):
+        row = (str(timestamp or datetime.now()), store_name, rating, review)
+        self._append_rows(self.feedback_path, FEEDBACK_COLUMNS, [row])
+
+    def read_clicks(self):
+        return read_click_csv(self.click_path)
+
+    def read_feedback(self):
+        return read_feedback_csv(self.feedback_path)
+
+    def iter_clicks_after(self, cursor=0, chunksize=100000):
+        # 파일 전체를 메모리에 올리지 않도록 chunksize 행씩 읽음 (cursor = 이미 읽은 데이터 행 수)
+        if not os.path.exists(self.click_path):
+            return
+        skip = cursor
+        reader = pd.read_csv(self.click_path, chunksize=chunksize, skiprows=lambda i: 0 < i <= skip)
+        for chunk in reader:
+            cursor += len(chunk)
+            yield chunk, cursor
+
+    def read_clicks_page(self, offset=0, limit=100):
+        # 파일은 시간순으로 추가되므로 전체 행 수를 센 뒤 끝에서부터 필요한 구간만 읽음
+        if not os.path.exists(self.click_path):
+            return pd.DataFrame(columns=CLICK_COLUMNS)
+        with open(self.click_path, encoding='utf-8') as f:
+            total = sum(1 for _ in f) - 1
+        end = max(total - offset, 0)
+        start = max(end - limit, 0)
+        df = pd.read_csv(self.click_path, skiprows=lambda i: 0 < i <= start, nrows=end - start)
+        return df.iloc[::-1].reset_index(drop=True)
+
+    def data_version(self):
+        return (file_version(self.click_path), file_version(self.feedback_path))
+
+
+def open_store(base_dir, backend=None):
+    """설정된 백엔드의 저장소를 열어 반환하는 함수 (SQLite는 최초 실행 시 CSV를 이관)"""
+    backend = backend or os.environ.get(BACKEND_ENV, 'sqlite')
+    click_path = os.path.join(base_dir, LOG_FILE)
+    feedback_path = os.path.join(base_dir, FEEDBACK_FILE)
+    if backend == 'csv':
+        return CSVEventStore(click_path, feedback_path)
+    if backend != 'sqlite':
+        raise ValueError(f"알 수 없는 저장소 백엔드입니다: {backend}")
+    store = SQLiteEventStore(os.path.join(base_dir, DB_FILE))
+    store.migrate_from_csv(feedback_path, click_path)
+    return store
@@ -0,0 +1,118 @@
+# 최근 인기(트렌딩) 계산 모듈 - 시간 버킷 카운터에 지수 감쇠를 적용하여 오래된 조회/리뷰의 영향을 줄임
+
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+
+def _to_epoch_seconds(timestamps):
+    """타임스탬프 문자열/Datetime 배열을 초 단위 정수 배열로 변환"""
+    values = pd.to_datetime(pd.Series(timestamps), errors='coerce', format='mixed')
+    seconds = values.to_numpy(dtype='datetime64[s]').astype('int64')
+    return seconds, values.notna().to_numpy()
+
+
+class DecayedBucketCounter:
+    """키(가게)별로 최근 num_buckets개 시간 버킷의 개수를 링 버퍼에 보관하고, 감쇠 가중합을 점수로 사용"""
+
+    def __init__(self, bucket_seconds=3600, num_buckets=24 * 7, half_life_buckets=24):
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+        self.half_life_buckets = half_life_buckets
+        self._keys = {}
+        self._names = []
+        self._counts = np.zeros((16, num_buckets))
+        # 링 버퍼 각 칸이 현재 어느 절대 버킷 번호를 담고 있는지 (-1: 비어 있음)
+        self._slot_bucket = np.full(num_buckets, -1, dtype='int64')
+
+    def _rows_for(self, keys):
+        rows = np.empty(len(keys), dtype='int64')
+        for i, key in enumerate(keys):
+            row = self._keys.get(key)
+            if row is None:
+                row = self._keys[key] = len(self._names)
+                self._names.append(key)
+            rows[i] = row
+        if len(self._names) > len(self._counts):
+            grown = np.zeros((max(len(self._names), len(self._counts) * 2), self.num_buckets))
+            grown[:len(self._counts)] = self._counts
+            self._counts = grown
+        return rows
+
+    def add_many(self, keys, epoch_seconds, weights=1.0):
+        """여러 이벤트를 한 번에 반영 (버킷 범위를 벗어난 오래된 이벤트는 무시)"""
+        if len(keys) == 0:
+            return
+        buckets = np.asarray(epoch_seconds, dtype='int64') // self.bucket_seconds
+        weights = np.broadcast_to(np.asarray(weights, dtype=float), buckets.shape)
+        newest = max(int(buckets.max()), int(self._slot_bucket.max()))
+        keep = buckets > newest - self.num_buckets
+        if not keep.any():
+            return
+        keys = [k for k, flag in zip(keys, keep) if flag]
+        buckets, weights = buckets[keep], weights[keep]
+
+        slots = buckets % self.num_buckets
+        # 새 버킷이 들어올 칸은 이전 내용을 비우고 재사용 (슬라이딩 윈도우)
+        for slot in np.unique(slots):
+            bucket = buckets[slots == slot].max()
+            if self._slot_bucket[slot] < bucket:
+                self._counts[:, slot] = 0
+                self._slot_bucket[slot] = bucket
+        valid = buckets == self._slot_bucket[slots]
+        rows = self._rows_for(keys)
+        np.add.at(self._counts, (rows[valid], slots[valid]), weights[valid])
+
+    def scores(self, now=None):
+        """현재 시각 기준 감쇠 가중합 점수를 가게 이름 인덱스의 Series로 반환"""
+        now = now or datetime.now()
+        current = int(pd.Timestamp(now).value // 10**9) // self.bucket_seconds
+        age = current - self._slot_bucket
+        valid = (self._slot_bucket >= 0) & (age >= 0) & (age < self.num_buckets)
+        decay = np.where(valid, 0.5 ** (np.clip(age, 0, None) / self.half_life_buckets), 0.0)
+        n = len(self._names)
+        return pd.Series(self._counts[:n] @ decay, index=pd.Index(self._names, dtype=object), dtype=float)
+
+
+class TrendingTracker:
+    """저장소에 새로 추가된 가게 조회/리뷰만 읽어 트렌딩 카운터를 갱신하는 클래스"""
+
+    def __init__(self, view_weight=0.05, review_weight=1.0, bucket_seconds=3600, num_buckets=24 * 7, half_life_buckets=24):
+        self.view_weight = view_weight
+        self.review_weight = review_weight
+        self.window = timedelta(seconds=bucket_seconds * num_buckets)
+        self.views = DecayedBucketCounter(bucket_seconds, num_buckets, half_life_buckets)
+        self.reviews = DecayedBucketCounter(bucket_seconds, num_buckets, half_life_buckets)
+        self._click_cursor = 0
+        self._feedback_cursor = 0
+        self._version = None
+        self._lock = threading.Lock()
+
+    def sync(self, store):
+        """마지막 동기화 이후 추가된 이벤트만 카운터에 반영 (데이터 버전이 같으면 아무것도 하지 않음)"""
+        version = store.data_version()
+        with self._lock:
+            if version == self._version:
+                return
+            # 첫 동기화 시에는 윈도우 범위 안의 이벤트만 읽음
+            since = datetime.now() - self.window if self._version is None else None
+            clicks, self._click_cursor = store.read_clicks_after(self._click_cursor, since=since, log_type='store_view')
+            feedback, self._feedback_cursor = store.read_feedback_after(self._feedback_cursor, since=since)
+            self._add(self.views, clicks['value'], clicks['timestamp'])
+            self._add(self.reviews, feedback['store_name'], feedback['timestamp'])
+            self._version = version
+
+    @staticmethod
+    def _add(counter, names, timestamps):
+        seconds, ok = _to_epoch_seconds(timestamps)
+        ok = ok & names.notna().to_numpy()
+        counter.add_many(names[ok].tolist(), seconds[ok])
+
+    def scores(self, now=None):
+        """가게별 트렌딩 점수 (최근 조회수 * view_weight + 최근 리뷰수 * review_weight, 감쇠 적용)"""
+        with self._lock:
+            views = self.views.scores(now)
+            reviews = self.reviews.scores(now)
+        return views.mul(self.view_weight).add(reviews.mul(self.review_weight), fill_value=0.0)
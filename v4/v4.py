@@ -1,19 +1,30 @@
 # pip install streamlit pandas pydeck wordcloud matplotlib
 
+import profiler         # 시작 시간 측정 모듈 (KUSIS_PROFILE=1 일 때만 동작)
+profiler.install_import_timer()
+
 import streamlit as st  # Streamlit 라이브러리 (웹 앱 프레임워크)
 import pandas as pd     # Pandas 라이브러리 (데이터 처리 및 분석)
 import pydeck as pdk    # Pydeck 라이브러리 (지도 시각화)
 from datetime import datetime # datetime 모듈 (타임스탬프 기록용)
 import os               # os 모듈 (파일 존재 여부 확인용)
 import time             # time 모듈 (잠시 멈춤 기능용)
-import csv              # CSV quoting 처리를 위한 모듈
 
-# <--- 워드 클라우드 기능 추가 및 Matplotlib 폰트 등록을 위한 라이브러리
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-from matplotlib import font_manager
-import re
-# <--- 여기까지 수정
+# 워드 클라우드용 wordcloud / matplotlib는 무거우므로 render_word_cloud_png 안에서 처음 사용할 때 import
+
+from storage import open_store, file_version  # 클릭/피드백 저장소 (SQLite WAL 기본, CSV 호환)
+from cache import VersionedCache  # 데이터 버전 기반 캐시
+from reviews import FeedbackIndex  # 가게별 리뷰 인덱스
+from click_writer import BatchedClickWriter  # 클릭 로그 비동기 일괄 기록기
+from ranking import RankingEngine  # 추천 순위 미리 계산
+from trending import TrendingTracker  # 최근 인기(트렌딩) 카운터
+from analytics import ClickRollup, SketchedClickCounter  # 관리자 클릭 분석 (정확 / 근사 집계)
+from wordcloud_cache import RENDER_VERSION, DiskLRUCache, render_word_cloud_png  # 워드 클라우드 이미지 디스크 캐시
+from keywords import KeywordIndex  # 가게별 리뷰 키워드 빈도 인덱스
+from search import SearchIndex  # 가게/혜택 n-gram 검색
+from geo import GridIndex  # 위치 기반 주변 가게 검색 (격자 공간 색인)
+from catalog import StoreCatalog, load_catalog  # 압축된 가게 카탈로그 (category / float32 / 긴 텍스트 분리, Arrow 스냅샷)
+from map_layers import MapPointSet, ZOOM_LEVELS, build_store_map  # 지도 레이어 (컬럼 축소 + 줌 단계별 클러스터)
 
 def get_absolute_path(filename):
     """스크립트 파일 위치를 기준으로 파일의 절대 경로를 반환"""
@@ -129,22 +140,31 @@ st.markdown(custom_css, unsafe_allow_html=True)
 # ---------------------------------
 # 데이터 로딩 및 유틸리티 함수
 # ---------------------------------
-LOG_FILE = 'click_log.csv'
-FEEDBACK_FILE = 'feedback.csv'
+@st.cache_resource
+def get_event_store():
+    """프로세스 전체에서 공유하는 클릭/피드백 저장소를 반환 (최초 실행 시 CSV 이관)"""
+    return open_store(os.path.dirname(os.path.abspath(__file__)))
+
+@st.cache_resource
+def get_data_cache():
+    """프로세스 전체에서 공유하는 데이터 버전 기반 캐시를 반환"""
+    return VersionedCache()
+
+@st.cache_resource
+def get_click_writer():
+    """클릭 로그를 백그라운드에서 모아서 기록하는 기록기를 반환 (종료 시 자동 flush)"""
+    writer = BatchedClickWriter(get_event_store())
+    # 관리자 대시보드의 근사 Top-N 스케치는 기록될 때마다 바로 갱신 (대시보드에서 로그를 다시 읽지 않음)
+    writer.add_listener(get_click_sketch().record)
+    return writer
 
 def log_click(log_type, value):
-    """사용자 클릭 로그를 CSV 파일에 기록(추가)하는 함수"""
-    if not os.path.exists(get_absolute_path(LOG_FILE)):
-        pd.DataFrame(columns=['timestamp', 'type', 'value']).to_csv(get_absolute_path(LOG_FILE), index=False)
-    new_log = pd.DataFrame({'timestamp': [datetime.now()], 'type': [log_type], 'value': [value]})
-    new_log.to_csv(get_absolute_path(LOG_FILE), mode='a', header=False, index=False)
+    """사용자 클릭 로그를 기록 큐에 추가하는 함수 (파일/DB 기록은 백그라운드에서 처리)"""
+    get_click_writer().log(log_type, value)
 
 def save_feedback(store_name, rating, review):
-    """사용자 피드백(가게 이름, 별점, 리뷰)을 CSV 파일에 기록(추가)하는 함수"""
-    if not os.path.exists(get_absolute_path(FEEDBACK_FILE)):
-        pd.DataFrame(columns=['timestamp', 'store_name', 'rating', 'review']).to_csv(get_absolute_path(FEEDBACK_FILE), index=False)
-    new_feedback = pd.DataFrame({'timestamp': [datetime.now()], 'store_name': [store_name], 'rating': [rating], 'review': [review]})
-    new_feedback.to_csv(get_absolute_path(FEEDBACK_FILE), mode='a', header=False, index=False)
+    """사용자 피드백(가게 이름, 별점, 리뷰)을 저장소에 기록(추가)하는 함수"""
+    get_event_store().append_feedback(store_name, rating, review)
 
 def get_star_rating(rating):
     """숫자 평점을 별 이모지 문자열로 변환하는 함수"""
@@ -154,89 +174,175 @@ def get_star_rating(rating):
     return stars
 
 def load_feedback_data_stable():
-    """KeyError 방지를 위해 강제적인 컬럼 재할당 및 인코딩 처리를 적용하여 리뷰 데이터를 로드"""
+    """저장소에서 리뷰 데이터를 로드 (실패 시 빈 DataFrame 반환)"""
     try:
-        # Streamlit Cloud 환경에서 BOM 문제 및 헤더 문제를 강제 해결 (최종 안정화)
-        df = pd.read_csv(
-            get_absolute_path(FEEDBACK_FILE), 
-            engine='python',
-            encoding='utf-8-sig', # BOM 처리
-            header=None,
-            skiprows=1
-        )
-        # 컬럼 이름 명시적 재할당
-        df.columns = ['timestamp', 'store_name', 'rating', 'review']
-        df['rating'] = pd.to_numeric(df['rating'], errors='coerce') 
-        return df
-    except Exception as e:
+        return get_event_store().read_feedback()
+    except Exception:
         # 로드 실패 시 빈 DataFrame 반환
         return pd.DataFrame(columns=['timestamp', 'store_name', 'rating', 'review'])
-    
-# @st.cache_data를 사용하여 캐싱 (성능 향상)
-@st.cache_data
-def load_data_and_calculate_stats(filepath, feedback_filepath, log_filepath):
-    """메인 데이터와 통계 데이터를 로드 및 병합하는 함수"""
-    
-    # 1. 메인 데이터 로드
+
+def get_feedback_index():
+    """리뷰가 추가된 경우에만 다시 만드는 가게별 리뷰 인덱스를 반환"""
+    version = get_event_store().feedback_version()
+    return get_data_cache().get('feedback_index', version, lambda: FeedbackIndex(load_feedback_data_stable()))
+
+def load_store_data(filepath):
+    """메인 데이터를 로드하는 함수 (build_catalog.py로 만든 최신 스냅샷이 있으면 CSV 파싱 없이 메모리 매핑으로 읽음)"""
     try:
-        data = pd.read_csv(filepath)
-        data.dropna(subset=['lat', 'lon'], inplace=True)
-        data.rename(columns={"카테코리(대)": "카테고리(대)", "카테고리(중)": "카테고리(중)"}, inplace=True)
-        data['카테고리(대)'] = data['카테고리(대)'].fillna('기타')
-        data['카테고리(중)'] = data['카테고리(중)'].fillna('기타')
+        return load_catalog(filepath, get_absolute_path(CATALOG_SNAPSHOT))
     except FileNotFoundError:
         st.error(f"❌ 데이터 파일('{filepath}')을 찾을 수 없습니다. 'data_ver2.csv' 파일이 있는지 확인해주세요.")
         return pd.DataFrame()
 
-    # 2. 피드백 통계 계산 (평균별점, 리뷰수) - 캐시된 로직은 안정화된 함수 호출
+def store_stat_columns(data):
+    """가게별 통계(평균별점, 리뷰수, 조회수)를 data의 행 순서에 맞춘 컬럼 dict로 반환"""
+    # 기록 시점에 미리 집계된 store_stats 사용
     try:
-        feedback_df = load_feedback_data_stable()
-        
-        feedback_stats = feedback_df.groupby('store_name')['rating'].agg(['mean', 'count']).rename(columns={'mean': '평균별점', 'count': '리뷰수'}).round(1)
-        feedback_stats.reset_index(inplace=True)
-        feedback_stats.rename(columns={'store_name': '가게이름'}, inplace=True)
+        store_stats = get_event_store().read_store_stats()
+        stats = pd.DataFrame({
+            '가게이름': store_stats['store_name'],
+            '평균별점': (store_stats['rating_sum'] / store_stats['rating_count'].where(store_stats['rating_count'] > 0)).round(1),
+            '리뷰수': store_stats['rating_count'],
+            '조회수': store_stats['view_count'],
+        })
     except Exception: # 넓은 예외 처리로 로드 실패를 방지하고 빈 DF 반환
-        feedback_stats = pd.DataFrame({'가게이름': [], '평균별점': [], '리뷰수': []})
-    
-    # 3. 클릭 로그 통계 계산 (조회수)
-    try:
-        log_df = pd.read_csv(log_filepath)
-        store_clicks = log_df[log_df['type'] == 'store_view']['value'].value_counts().rename('조회수')
-        store_clicks = store_clicks.to_frame().reset_index()
-        store_clicks.columns = ['가게이름', '조회수']
-    except FileNotFoundError:
-        store_clicks = pd.DataFrame({'가게이름': [], '조회수': []})
-
-    # 4. 모든 통계 데이터를 메인 데이터와 병합
-    data = pd.merge(data, feedback_stats, on='가게이름', how='left')
-    data = pd.merge(data, store_clicks, on='가게이름', how='left')
-    data['평균별점'] = data['평균별점'].fillna(0.0)
-    data['리뷰수'] = data['리뷰수'].fillna(0).astype(int)
-    data['조회수'] = data['조회수'].fillna(0).astype(int)
-
-    return data
-
-# 통계가 추가된 데이터프레임 로드
-df_with_stats = load_data_and_calculate_stats(get_absolute_path('data_ver2.csv'), 
-                                              get_absolute_path(FEEDBACK_FILE), 
-                                              get_absolute_path(LOG_FILE))
-
-
-@st.cache_resource 
-def generate_word_cloud(review_texts, title="리뷰 기반 워드 클라우드"):
-    """제공된 리뷰 텍스트를 기반으로 워드 클라우드를 생성하고 Streamlit에 표시"""
-    
-    # NameError 수정: 텍스트 전처리 로직 복구
-    text = " ".join(review_texts.astype(str))
-    text = re.sub('[^가-힣a-zA-Z0-9\s]', '', text) 
-    
-    if not text.strip():
-        st.info("워드 클라우드를 생성할 리뷰 텍스트가 부족합니다.")
-        return
+        stats = pd.DataFrame({'가게이름': [], '평균별점': [], '리뷰수': [], '조회수': []})
+
+    # 가게 이름으로 통계를 맞춰 붙임 (left merge와 같은 결과, 통계가 없는 가게는 0)
+    aligned = stats.set_index('가게이름').reindex(data['가게이름'])
+    return {
+        '평균별점': aligned['평균별점'].fillna(0.0).to_numpy(),
+        '리뷰수': aligned['리뷰수'].fillna(0).astype(int).to_numpy(),
+        '조회수': aligned['조회수'].fillna(0).astype(int).to_numpy(),
+    }
 
-    stop_words = set(['합니다', '입니다', '했어요', '좋아요', '있습니다', '아니요', '해요', '하세요', '이다', '이예요', '합니다', '했습니다', '이에요', '않습니다', '같습니다', '아닙니다', '최고', '맛있음'])
-    
-    # --- 폰트 경로 탐색 및 안정화 ---
+def load_data_and_calculate_stats(filepath):
+    """메인 데이터와 통계 데이터를 로드 및 병합하는 함수"""
+    data = load_store_data(filepath)
+    if data.empty:
+        return data
+    return data.assign(**store_stat_columns(data))
+
+# 배포 시 'python build_catalog.py'로 생성하는 가게 카탈로그 스냅샷 파일
+CATALOG_SNAPSHOT = 'catalog.arrow'
+
+# 추천 점수 가중치: Rank_Score = (평균 별점 * 10) + (총 리뷰 수 * 1) + (총 조회 수 * 0.05)
+RANK_WEIGHTS = {'평균별점': 10.0, '리뷰수': 1.0, '조회수': 0.05}
+
+def get_catalog_version(filepath):
+    """메인 데이터 파일(및 스냅샷)의 현재 버전을 반환 (가게 목록/문구/좌표만 쓰는 캐시의 키로 사용)"""
+    return (file_version(filepath), file_version(get_absolute_path(CATALOG_SNAPSHOT)))
+
+def get_stats_version(catalog_version):
+    """가게 데이터 버전과 가게별 통계의 현재 버전을 반환 (통계/순위 캐시의 키로 사용 - 조회 외의 클릭으로는 바뀌지 않음)"""
+    return catalog_version + (get_event_store().stats_version(),)
+
+def get_base_catalog(filepath, catalog_version):
+    """가게 데이터 파일이 바뀐 경우에만 다시 읽는 통계 없는 압축 카탈로그 (파싱, 카테고리 변환, 텍스트 압축)"""
+    return get_data_cache().get(('base_catalog', filepath), catalog_version, lambda: StoreCatalog(load_store_data(filepath)))
+
+def get_store_catalog(filepath, catalog_version, stats_version):
+    """가게별 통계가 바뀐 경우에는 통계 컬럼만 다시 붙인 카탈로그를 반환 (가게 데이터는 다시 읽지 않음)"""
+    def build():
+        base = get_base_catalog(filepath, catalog_version)
+        if base.empty:
+            return base
+        return base.with_columns(**store_stat_columns(base.frame))
+    return get_data_cache().get(('catalog', filepath), stats_version, build)
+
+def get_ranking_engine(df, version):
+    """데이터 버전마다 한 번만 추천 순위를 계산해 두는 RankingEngine을 반환"""
+    key = ('ranking', tuple(sorted(RANK_WEIGHTS.items())))
+    return get_data_cache().get(key, version, lambda: RankingEngine(df, RANK_WEIGHTS))
+
+def get_search_index(catalog_version):
+    """가게 데이터 파일 버전마다 한 번만 만드는 가게/혜택 검색 색인 (리뷰/조회가 늘어도 다시 만들지 않음)"""
+    return get_data_cache().get('search', catalog_version, lambda: SearchIndex(store_catalog.with_text(['caption', '주소'])))
+
+def search_stores(query, limit=10):
+    """검색 색인으로 가게를 찾고, 현재 RankingEngine의 Rank_Score와 통계를 반영한 결과를 반환"""
+    # 카탈로그 행 순서는 가게 데이터 파일로만 정해지므로 색인의 행 번호가 ranking_engine.df와 일치
+    return get_search_index(catalog_version).search(query, limit, rank_scores=ranking_engine.scores, frame=ranking_engine.df)
+
+def get_geo_index(catalog_version):
+    """가게 데이터 파일 버전마다 한 번만 만드는 가게 좌표 격자 색인 (좌표는 리뷰/조회와 무관)"""
+    return get_data_cache().get('geo', catalog_version, lambda: GridIndex(store_catalog.frame['lat'], store_catalog.frame['lon']))
+
+def get_store_map(sub_category, version, detail='보통', show_my_location=False):
+    """소분류 지도(클러스터 레이어 + 직렬화된 JSON)를 (소분류, 상세도, 내 위치 표시) 조합마다 한 번만 생성"""
+    cache = get_data_cache()
+    points = cache.get(('map_points', sub_category), version, lambda: MapPointSet(ranking_engine.store_list(sub_category)))
+
+    def build():
+        extra_layers = []
+        if show_my_location:
+            extra_layers.append(pdk.Layer(
+                'ScatterplotLayer', data=[{'lat': MY_LOCATION[0], 'lon': MY_LOCATION[1]}], get_position='[lon, lat]',
+                get_color='[30, 100, 220, 255]', get_radius=50, pickable=True
+            ))
+        return build_store_map(points, ZOOM_LEVELS[detail], extra_layers)
+
+    return cache.get(('store_map', sub_category, detail, show_my_location), version, build)
+
+def find_nearby_stores(lat, lon, radius_m=None, k=None, sort_by='거리순'):
+    """(lat, lon) 주변 가게를 '거리(m)' 컬럼과 함께 반환 - radius_m 이내 전체 또는 가장 가까운 k개"""
+    # 카탈로그 행 순서는 가게 데이터 파일로만 정해지므로 색인의 행 번호가 ranking_engine.df와 일치
+    geo_index = get_geo_index(catalog_version)
+    if radius_m is not None:
+        positions, distances = geo_index.within(lat, lon, radius_m)
+        if k is not None:
+            positions, distances = positions[:k], distances[:k]
+    else:
+        positions, distances = geo_index.nearest(lat, lon, k or 5)
+    nearby = ranking_engine.df.iloc[positions].copy()
+    nearby['거리(m)'] = distances.round().astype(int)
+    if sort_by == '별점순':
+        nearby = nearby.sort_values(['평균별점', '거리(m)'], ascending=[False, True], kind='stable')
+    return nearby
+
+@st.cache_resource
+def get_click_rollup():
+    """관리자 대시보드용 클릭 집계 (로그를 청크 단위로 누적하여 메모리 사용량 제한)"""
+    return ClickRollup()
+
+@st.cache_resource
+def get_click_sketch():
+    """관리자 대시보드용 근사 Top-N 스케치 (click_sketch.json에 저장되어 재시작 후에도 이어서 집계)"""
+    return SketchedClickCounter(get_absolute_path('click_sketch.json'))
+
+@st.cache_resource
+def get_trending_tracker():
+    """프로세스 전체에서 공유하는 트렌딩 카운터 (최근 7일, 시간 단위 버킷, 반감기 24시간)"""
+    return TrendingTracker(view_weight=RANK_WEIGHTS['조회수'], review_weight=RANK_WEIGHTS['리뷰수'])
+
+def get_trending_stores(engine, version, k=3):
+    """새로 추가된 조회/리뷰만 카운터에 반영한 뒤, 최근 인기 상위 k개 가게를 반환"""
+    tracker = get_trending_tracker()
+    tracker.sync(get_event_store())
+    # 감쇠 점수는 시간 버킷이 바뀔 때만 달라지므로 (데이터 버전, 현재 시각 버킷) 단위로 캐시
+    current_bucket = datetime.now().strftime('%Y%m%d%H')
+    return get_data_cache().get(('trending', k), (version, current_bucket), lambda: engine.top_by_scores(tracker.scores(), k))
+
+# 내 위치 (위치 정보가 없을 때 기본값: 건국대학교 서울캠퍼스)
+MY_LOCATION = (37.544357, 127.075985)
+
+# 통계가 추가된 데이터프레임 및 순위 로드 (새 리뷰/가게 조회가 생기면 자동으로 갱신)
+DATA_FILE = get_absolute_path('data_ver2.csv')
+with profiler.measure_first('load', 'df_with_stats'):
+    catalog_version = get_catalog_version(DATA_FILE)
+    stats_version = get_stats_version(catalog_version)
+    store_catalog = get_store_catalog(DATA_FILE, catalog_version, stats_version)
+    df_with_stats = store_catalog.frame
+    ranking_engine = get_ranking_engine(df_with_stats, stats_version)
+
+
+@st.cache_resource
+def get_word_cloud_cache():
+    """워드 클라우드 PNG 디스크 캐시 (.wordcloud_cache 폴더, 최대 64MB, 오래 안 쓴 이미지부터 삭제)"""
+    return DiskLRUCache(get_absolute_path('.wordcloud_cache'))
+
+def find_font_path():
+    """워드 클라우드에 사용할 한글 폰트 경로를 찾는 함수 (없으면 None)"""
     font_filename = 'NanumGothic.ttf'
     
     # 1. 스크립트 파일 위치를 기준으로 절대 경로를 생성합니다.
@@ -251,48 +357,50 @@ def generate_word_cloud(review_texts, title="리뷰 기반 워드 클라우드")
     if not os.path.exists(font_path):
         system_font_path = 'c:/Windows/Fonts/malgun.ttf'
         if os.path.exists(system_font_path):
-            font_path = system_font_path
-        else:
-            font_path = None 
-            st.warning(f"❌ '{font_filename}' (NanumGothic) 폰트 파일을 찾을 수 없습니다. 한글이 깨지는 원인입니다.")
-
-    # 3. WordCloud 생성
-    wc = WordCloud(
-        font_path=font_path, # 설정된 폰트 경로 사용
-        width=800,
-        height=400,
-        background_color='white',
-        max_words=100,
-        min_font_size=10,
-        colormap='summer',
-        stopwords=stop_words
-    ).generate(text)
-
-    # 4. Matplotlib 폰트 객체 생성 및 제목에 직접 전달 (오류 및 깨짐 방지)
-    fig, ax = plt.subplots(figsize=(6, 3))
-    ax.imshow(wc, interpolation='bilinear')
-    ax.axis('off')
-    
-    if font_path is not None:
-        try:
-            font_prop = font_manager.FontProperties(fname=font_path)
-            ax.set_title(title, fontsize=16, fontproperties=font_prop)
-        except Exception as e:
-            ax.set_title(title, fontsize=16)
-    else:
-        ax.set_title(title, fontsize=16)
-
-    st.pyplot(fig)
+            return system_font_path
+        st.warning(f"❌ '{font_filename}' (NanumGothic) 폰트 파일을 찾을 수 없습니다. 한글이 깨지는 원인입니다.")
+        return None
+    return font_path
+
+@st.cache_resource
+def get_keyword_index():
+    """프로세스 전체에서 공유하는 가게별 키워드 빈도 인덱스"""
+    return KeywordIndex()
+
+def get_synced_keyword_index():
+    """새로 추가된 리뷰만 반영한 키워드 인덱스를 반환"""
+    keyword_index = get_keyword_index()
+    keyword_index.sync(get_event_store())
+    return keyword_index
+
+def generate_word_cloud(title="리뷰 기반 워드 클라우드", store_name=None):
+    """가게(없으면 전체) 리뷰 키워드로 워드 클라우드를 표시 - 키워드 빈도가 같으면 디스크에 저장된 이미지를 재사용"""
+    # 미리 집계된 키워드 빈도를 사용하므로 리뷰 전체를 다시 토큰화하지 않음
+    # 캐시 키는 실제로 그릴 빈도와 같은 시점의 인덱스 상태 + 이미지 생성/토큰화 버전으로 만듦
+    keyword_version, frequencies = get_synced_keyword_index().snapshot(store_name)
+    font_path = find_font_path()
+    cache_key = (RENDER_VERSION, keyword_version, store_name or "전체", title, font_path)
+
+    def build_image():
+        if not frequencies:
+            return None
+        return render_word_cloud_png(frequencies, title, font_path)
+
+    image = get_word_cloud_cache().get_or_create(cache_key, build_image)
+    if image is None:
+        st.info("워드 클라우드를 생성할 리뷰 텍스트가 부족합니다.")
+        return
+    st.image(image)
 
 
 def get_sub_category_stats(major_cat):
     """특정 대분류 내 모든 소분류의 통계 요약을 계산하여 반환"""
     
-    # 1. 대분류로 필터링
-    filtered_df = df_with_stats[df_with_stats['카테고리(대)'] == major_cat]
+    # 1. 대분류로 필터링 (미리 계산된 대분류 → 행 위치 맵 사용)
+    filtered_df = store_catalog.rows_for_major(major_cat)
     
     # 2. 소분류별 통계 집계
-    sub_stats = filtered_df.groupby('카테고리(중)').agg(
+    sub_stats = filtered_df.groupby('카테고리(중)', observed=True).agg(
         총_가게수=('가게이름', 'count'),
         평균_별점=('평균별점', 'mean'),
         총_리뷰수=('리뷰수', 'sum'),
@@ -329,13 +437,69 @@ def render_home_page():
     
     st.markdown("---")
     
+    # ---------------------------------------------
+    # 0. SEARCH (가게 이름/혜택/주소 검색)
+    # ---------------------------------------------
+    query = st.text_input("🔍 가게 이름, 혜택, 주소로 검색", placeholder="예: 할인, 커피, 화양동", key='search_query')
+    if query.strip() and not df_with_stats.empty:
+        results = search_stores(query, limit=10)
+        if results.empty:
+            st.info(f"'{query}'에 대한 검색 결과가 없습니다.")
+        else:
+            st.write(f"**검색 결과 {len(results)}건**")
+            for i, (_, row) in enumerate(results.iterrows()):
+                col_info, col_btn = st.columns([5, 1])
+                with col_info:
+                    benefit = row['benefit'] if pd.notna(row['benefit']) else ''
+                    st.markdown(f"**{row['가게이름']}** · {row['카테고리(중)']} · ⭐ {row['평균별점']:.1f} ({row['리뷰수']})  \n{benefit[:60]}")
+                with col_btn:
+                    if st.button("보기", key=f"search_result_{i}", width='stretch'):
+                        log_click('store_view', row['가게이름'])
+                        st.session_state.selected_store = row['가게이름']
+                        st.session_state.page = 'store_detail_map'
+                        st.rerun()
+        st.markdown("---")
+
+    # ---------------------------------------------
+    # 0-1. NEARBY (내 위치 주변 제휴업체)
+    # ---------------------------------------------
+    if not df_with_stats.empty:
+        with st.expander("📍 내 주변 제휴업체 찾기"):
+            # URL에 ?lat=..&lon=.. 이 있으면 그 위치를, 없으면 기본 위치를 사용
+            try:
+                default_lat = float(st.query_params.get('lat', MY_LOCATION[0]))
+                default_lon = float(st.query_params.get('lon', MY_LOCATION[1]))
+            except ValueError:
+                default_lat, default_lon = MY_LOCATION
+            col_lat, col_lon = st.columns(2)
+            my_lat = col_lat.number_input("위도", value=default_lat, format="%.6f", key='nearby_lat')
+            my_lon = col_lon.number_input("경도", value=default_lon, format="%.6f", key='nearby_lon')
+            col_radius, col_sort = st.columns(2)
+            radius_m = col_radius.selectbox("반경", [300, 500, 1000], format_func=lambda m: f"{m}m", key='nearby_radius')
+            sort_by = col_sort.radio("정렬", ["거리순", "별점순"], horizontal=True, key='nearby_sort')
+
+            nearby = find_nearby_stores(my_lat, my_lon, radius_m=radius_m, sort_by=sort_by)
+            if nearby.empty:
+                nearest = find_nearby_stores(my_lat, my_lon, k=1)
+                if nearest.empty:
+                    st.info("좌표가 등록된 제휴업체가 없습니다.")
+                else:
+                    st.info(f"반경 {radius_m}m 안에 제휴업체가 없습니다. 가장 가까운 곳: **{nearest['가게이름'].iloc[0]}** ({nearest['거리(m)'].iloc[0]}m)")
+            else:
+                st.write(f"**반경 {radius_m}m 안의 제휴업체 {len(nearby)}곳**")
+                st.dataframe(
+                    nearby[['가게이름', '카테고리(중)', '거리(m)', '평균별점', '리뷰수', 'benefit']],
+                    hide_index=True, width='stretch'
+                )
+        st.markdown("---")
+
     # ---------------------------------------------
     # 1. CATEGORY SELECTION (맨 위로 이동)
     # ---------------------------------------------
     st.header("1. 원하는 제휴 카테고리를 선택하세요.")
     
     if not df_with_stats.empty:
-        major_categories = df_with_stats['카테고리(대)'].unique()
+        major_categories = store_catalog.major_categories()
         major_cols = st.columns(len(major_categories))
         
         for i, major_cat in enumerate(major_categories):
@@ -356,12 +520,16 @@ def render_home_page():
     st.header("✨ 오늘의 추천 제휴업체")
     
     if not df_with_stats.empty:
-        df_temp = df_with_stats.copy()
+        recommend_mode = st.radio("추천 기준", ["종합 추천", "🔥 지금 뜨는 가게 (최근 7일)"], horizontal=True, key='recommend_mode')
         
-        # 순위 점수 계산: (평균 별점 * 10) + (총 리뷰 수 * 1) + (총 조회 수 * 0.05)
-        df_temp['Rank_Score'] = (df_temp['평균별점'] * 10) + (df_temp['리뷰수']) + (df_temp['조회수'] * 0.05)
-        
-        top_3_stores = df_temp.sort_values(by='Rank_Score', ascending=False).head(3)
+        if recommend_mode == "종합 추천":
+            # 순위 점수(Rank_Score)는 데이터 버전마다 미리 계산된 RankingEngine에서 조회
+            top_3_stores = ranking_engine.top_stores(3)
+        else:
+            # 최근 조회/리뷰에 시간 감쇠를 적용한 트렌딩 점수 기준
+            top_3_stores = get_trending_stores(ranking_engine, stats_version, 3)
+            if top_3_stores.empty:
+                st.info("최근 7일간 조회/리뷰 기록이 없습니다.")
         
         if not top_3_stores.empty:
             top_cols = st.columns(3)
@@ -500,75 +668,55 @@ def render_store_list_view():
 
     if not df_with_stats.empty and current_sub:
         
-        filtered_df = df_with_stats[df_with_stats['카테고리(중)'] == current_sub].copy()
-        
-        ranking_df = filtered_df.sort_values(by=['조회수', '리뷰수'], ascending=[False, False])
+        # 조회수, 리뷰수 순으로 미리 정렬된 소분류 목록에서 현재 페이지만 잘라서 사용
+        total_stores = ranking_engine.store_count(current_sub)
         
-        st.header(f"🔎 총 {len(ranking_df)}개 가게 목록 (조회수 기준 정렬)")
+        st.header(f"🔎 총 {total_stores}개 가게 목록 (조회수 기준 정렬)")
 
         # --- 지도 시각화 추가 및 내 위치 레이어 포함 ---
-        if not filtered_df.empty:
+        if total_stores > 0:
             st.subheader(f"🗺️ '{current_sub}' 지역 지도")
             
-            center_lat = filtered_df['lat'].mean()
-            center_lon = filtered_df['lon'].mean()
-            
-            view_state = pdk.ViewState(latitude=center_lat, longitude=center_lon, zoom=14.5, pitch=20)
-            
-            store_layer = pdk.Layer(
-                'ScatterplotLayer', data=filtered_df, get_position='[lon, lat]', 
-                get_color='[2, 117, 41, 200]', get_radius=50, pickable=True, auto_highlight=True
-            )
-            
-            layers = [store_layer]
-            
-            # 내 위치 레이어 (요청 추가)
-            if st.session_state.show_my_location:
-                my_location_data = pd.DataFrame({'lat': [37.544357], 'lon': [127.075985]})
-                blue_layer = pdk.Layer(
-                    'ScatterplotLayer', data=my_location_data, get_position='[lon, lat]', 
-                    get_color='[30, 100, 220, 255]', get_radius=50, pickable=True
-                )
-                layers.append(blue_layer)
-            
-            tooltip = {"html": "<b>{가게이름}</b><br/>⭐ {평균별점}", "style": {"backgroundColor": "#027529", "color": "white"}}
-
-            st.pydeck_chart(pdk.Deck(
-                layers=layers, initial_view_state=view_state, map_style='light', tooltip=tooltip
-            ))
+            # 필요한 컬럼만 담은 클러스터 레이어를 데이터 버전마다 한 번 만들고 직렬화 결과까지 재사용
+            map_detail = st.select_slider("지도 상세도", options=list(ZOOM_LEVELS), value='보통', key='map_detail')
+            st.pydeck_chart(get_store_map(current_sub, stats_version, map_detail, st.session_state.show_my_location))
         # --- 지도 시각화 끝 ---
 
+        # --- 페이지 선택 (이전에 선택한 가게가 있으면 그 가게가 있는 페이지부터 표시) ---
+        page_size = 10
+        total_pages = max((total_stores - 1) // page_size + 1, 1)
+        selected_rank = ranking_engine.store_rank(current_sub, st.session_state.current_radio_selection)
+        default_page = selected_rank // page_size + 1 if selected_rank is not None else 1
+        list_page = st.number_input(f"페이지 (총 {total_pages}페이지)", min_value=1, max_value=total_pages, value=default_page, key=f'store_list_page_{current_sub}')
+        offset = (list_page - 1) * page_size
+
         display_columns = ['가게이름', '평균별점', '리뷰수', '조회수', 'benefit']
-        display_df = ranking_df[display_columns].reset_index(drop=True)
-        display_df.index = display_df.index + 1 
+        display_df = ranking_engine.store_page(current_sub, offset, page_size)[display_columns].reset_index(drop=True)
+        display_df.index = display_df.index + offset + 1
         display_df.index.name = '순위'
         display_df.rename(columns={'benefit': '제휴 혜택'}, inplace=True)
 
         st.subheader("💡 상세 정보를 볼 가게를 선택하세요.")
         
-        options_with_stats = []
-        for rank_num, row in display_df.iterrows():
-            display_name = f"{row.name}위 | {row['가게이름']} ⭐ {row['평균별점']:.1f}/5.0 ({row['리뷰수']})"
-            options_with_stats.append({'display': display_name, 'value': row['가게이름']})
-            
-        display_options = [opt['display'] for opt in options_with_stats]
-        actual_values = [opt['value'] for opt in options_with_stats]
+        # 현재 페이지의 선택지 문자열을 컬럼 단위 연산으로 한 번에 생성
+        actual_values = display_df['가게이름'].tolist()
+        display_options = (
+            display_df.index.astype(str) + "위 | " + display_df['가게이름'].astype(str)
+            + " ⭐ " + display_df['평균별점'].round(1).astype(str) + "/5.0 ("
+            + display_df['리뷰수'].astype(str) + ")"
+        ).tolist()
         
-        # --- ValueError 해결 및 선택 값 설정 ---
-        # 1. 초기값 또는 이전에 선택된 값의 인덱스를 찾습니다.
-        initial_store_name = st.session_state.current_radio_selection if 'current_radio_selection' in st.session_state else (actual_values[0] if actual_values else None)
-        
-        index_to_set = 0
-        if initial_store_name and initial_store_name in actual_values:
-            # ✅ 수정된 로직: 실제 가게 이름 목록(actual_values)에서 인덱스를 찾습니다.
-            index_to_set = actual_values.index(initial_store_name) 
+        # 이전에 선택된 가게가 이 페이지에 있으면 선택 상태로 표시, 없으면 아무것도 선택하지 않음
+        # (페이지를 넘길 때 첫 번째 가게가 자동 선택되어 상세 페이지로 넘어가지 않도록 함)
+        index_to_set = None
+        if st.session_state.current_radio_selection in actual_values:
+            index_to_set = actual_values.index(st.session_state.current_radio_selection)
 
-        # st.radio 생성
         selected_display = st.radio(
             "가게 선택", 
             options=display_options,
-            index=index_to_set, # 설정된 인덱스 사용
-            key='store_list_radio'
+            index=index_to_set,
+            key=f'store_list_radio_{current_sub}_{list_page}'
         )
         
         # 선택된 가게 이름을 실제 값으로 매핑
@@ -623,35 +771,32 @@ def render_store_detail_map():
         if st.button("📍 내 위치 표시/숨기기"):
             st.session_state.show_my_location = not st.session_state.show_my_location
             
-    # --- 데이터 필터링 로직 ---
-    if not df_with_stats.empty and current_store_name:
-        filtered_df = df_with_stats[df_with_stats['가게이름'] == current_store_name]
-    else:
+    # --- 데이터 조회 로직 (가게 이름 → 행 위치 맵으로 한 행만 조회, 긴 텍스트는 이때만 읽음) ---
+    selected_details = store_catalog.details(current_store_name) if current_store_name else None
+    if selected_details is None:
         st.warning("오류가 발생했습니다. 이전 화면으로 돌아가 다시 시도해주세요.")
         return
-
-    selected_details = filtered_df.iloc[0]
     
     # 지도 구성
-    if not filtered_df.empty:
-        view_state = pdk.ViewState(latitude=selected_details['lat'], longitude=selected_details['lon'], zoom=16, pitch=50)
-        
-        # ✅ 수정: get_radius를 60에서 20으로 축소
-        red_layer = pdk.Layer(
-            'ScatterplotLayer', data=filtered_df, get_position='[lon, lat]', 
-            get_color='[220, 30, 30, 255]', get_radius=20, pickable=True, auto_highlight=True)
-        
-        my_location_data = pd.DataFrame({'lat': [37.544357], 'lon': [127.075985]})
-        blue_layer = pdk.Layer(
-            'ScatterplotLayer', data=my_location_data, get_position='[lon, lat]', 
-            get_color='[30, 100, 220, 255]', get_radius=20, pickable=True)
-        
-        layers = [red_layer]
-        if st.session_state.show_my_location:
-            layers.append(blue_layer)
-        
-        st.pydeck_chart(pdk.Deck(
-            layers=layers, initial_view_state=view_state, map_style='light'))
+    store_lat, store_lon = float(selected_details['lat']), float(selected_details['lon'])
+    view_state = pdk.ViewState(latitude=store_lat, longitude=store_lon, zoom=16, pitch=50)
+    
+    # ✅ 수정: get_radius를 60에서 20으로 축소
+    red_layer = pdk.Layer(
+        'ScatterplotLayer', data=[{'가게이름': current_store_name, 'lat': store_lat, 'lon': store_lon}], get_position='[lon, lat]', 
+        get_color='[220, 30, 30, 255]', get_radius=20, pickable=True, auto_highlight=True)
+    
+    my_location_data = pd.DataFrame({'lat': [MY_LOCATION[0]], 'lon': [MY_LOCATION[1]]})
+    blue_layer = pdk.Layer(
+        'ScatterplotLayer', data=my_location_data, get_position='[lon, lat]', 
+        get_color='[30, 100, 220, 255]', get_radius=20, pickable=True)
+    
+    layers = [red_layer]
+    if st.session_state.show_my_location:
+        layers.append(blue_layer)
+    
+    st.pydeck_chart(pdk.Deck(
+        layers=layers, initial_view_state=view_state, map_style='light'))
             
     # --- 가게 상세 정보 표시 ---
     with st.container(border=True):
@@ -671,22 +816,17 @@ def render_store_detail_map():
             avg_rating_val = selected_details['평균별점']
             review_count = selected_details['리뷰수']
             
-            # --- 리뷰 데이터 로드 및 변환 (캐시되지 않은 데이터) ---
-            # ✅ 수정: 안정화된 유틸리티 함수 호출
-            store_feedback = load_feedback_data_stable() 
-            store_feedback = store_feedback[store_feedback['store_name'] == current_store_name]
+            # --- 리뷰 데이터 로드 (캐시된 인덱스에서 해당 가게 구간만 조회, 최신순 정렬됨) ---
+            feedback_index = get_feedback_index()
+            store_feedback = feedback_index.reviews_for(current_store_name)
             
             # --- 평점 및 최신 리뷰 요약 ---
             if review_count > 0:
                 st.metric(label="평균 별점", value=f"{avg_rating_val:.1f} / 5.0", delta=get_star_rating(avg_rating_val))
                 st.write("**최신 리뷰 3개**")
                 
-                # 3. 'timestamp' 컬럼을 사용한 정렬 (KeyError 발생 지점)
-                if 'timestamp' in store_feedback.columns:
-                    for _, row in store_feedback.sort_values('timestamp', ascending=False).head(3).iterrows():
-                        st.markdown(f"> {row['review']} ({get_star_rating(row['rating'])})")
-                else:
-                    st.warning("데이터 문제: 리뷰 정렬을 위한 'timestamp' 컬럼을 찾을 수 없습니다.")
+                for _, row in feedback_index.reviews_for(current_store_name, limit=3).iterrows():
+                    st.markdown(f"> {row['review']} ({get_star_rating(row['rating'])})")
 
             else:
                 st.warning("아직 등록된 리뷰가 없습니다.")
@@ -694,8 +834,7 @@ def render_store_detail_map():
             # --- 전체 리뷰 보기 섹션 추가 ---
             if not store_feedback.empty:
                 with st.expander("📝 전체 리뷰 보기"):
-                    full_reviews = store_feedback.sort_values('timestamp', ascending=False)
-                    st.dataframe(full_reviews[['timestamp', 'rating', 'review']], 
+                    st.dataframe(store_feedback[['timestamp', 'rating', 'review']], 
                                  use_container_width=True, 
                                  column_config={
                                      "timestamp": st.column_config.DatetimeColumn("날짜", format="YYYY-MM-DD"),
@@ -726,7 +865,10 @@ def render_store_detail_map():
     if 'store_feedback' in locals() and not store_feedback.empty:
         store_reviews = store_feedback['review']
         if len(store_reviews) > 0:
-            generate_word_cloud(store_reviews, title="가게 리뷰 키워드 분석") 
+            top_keywords = get_synced_keyword_index().top_keywords(current_store_name, 5)
+            if top_keywords:
+                st.markdown("**주요 키워드:** " + ", ".join(f"{word}({count})" for word, count in top_keywords))
+            generate_word_cloud(title="가게 리뷰 키워드 분석", store_name=current_store_name)
         else:
             st.info("이 가게는 워드 클라우드를 생성할 충분한 리뷰가 없습니다.")
 
@@ -759,36 +901,65 @@ def render_admin_dashboard():
 
     # --- 클릭 동향 분석 섹션 ---
     st.header("📊 사용자 클릭 동향 분석")
-    try:
-        log_df = pd.read_csv(get_absolute_path(LOG_FILE))
-        col1, col2, col3 = st.columns(3)
-        with col1: 
-            st.subheader("대분류 클릭 Top 10")
-            major_clicks = log_df[log_df['type'] == 'major_category']['value'].value_counts().head(10)
-            st.bar_chart(major_clicks, color="#027529")
-        with col2: 
-            st.subheader("중분류 클릭 Top 10")
-            sub_clicks = log_df[log_df['type'] == 'sub_category']['value'].value_counts().head(10)
-            st.bar_chart(sub_clicks, color="#027529")
-        with col3: 
-            st.subheader("가게 조회 Top 10")
-            store_clicks = log_df[log_df['type'] == 'store_view']['value'].value_counts().head(10)
-            st.bar_chart(store_clicks, color="#027529")
+    # 기본은 근사(스케치) 집계, 감사 시에는 정확한 집계로 전환
+    exact_mode = st.toggle("정확한 집계 사용 (감사용)", key='admin_exact_clicks')
+    click_counter = get_click_rollup() if exact_mode else get_click_sketch()
+    click_counter.sync(get_event_store())
+    if click_counter.total == 0:
+        st.warning("아직 수집된 클릭 로그 데이터가 없습니다.")
+    else:
+        chart_specs = [("대분류 클릭 Top 10", 'major_category'), ("중분류 클릭 Top 10", 'sub_category'), ("가게 조회 Top 10", 'store_view')]
+        for col, (subheader, log_type) in zip(st.columns(3), chart_specs):
+            with col:
+                st.subheader(subheader)
+                top_items = click_counter.top(log_type, 10)
+                st.bar_chart(pd.Series({item[0]: item[1] for item in top_items}, name='count'), color="#027529")
+                if not exact_mode:
+                    st.caption(f"근사 집계: 각 막대의 과대 추정 오차 ≤ {click_counter.error_bound(log_type):.0f}회")
         
         with st.expander("전체 클릭 로그 보기"):
-            st.dataframe(log_df.sort_values('timestamp', ascending=False), use_container_width=True)
-    except FileNotFoundError:
-        st.warning("아직 수집된 클릭 로그 데이터가 없습니다.")
+            # 요청한 페이지만 저장소에서 읽어 옴 (최신순)
+            page_size = 100
+            total_pages = (click_counter.total - 1) // page_size + 1
+            log_page = st.number_input(f"페이지 (총 {total_pages}페이지, {click_counter.total}건)", min_value=1, max_value=total_pages, value=1, key='click_log_page')
+            log_df = get_event_store().read_clicks_page(offset=(log_page - 1) * page_size, limit=page_size)
+            st.dataframe(log_df, use_container_width=True)
+
+    # --- 캐시/기록기 상태 섹션 ---
+    st.markdown("---")
+    st.header("⚙️ 데이터 캐시 및 클릭 기록 상태")
+    cache_stats = get_data_cache().stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("캐시 적중", cache_stats['hits'])
+    col2.metric("캐시 실패(재계산)", cache_stats['misses'])
+    col3.metric("적중률", f"{cache_stats['hit_rate']:.0%}")
+
+    writer_stats = get_click_writer().stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("기록된 클릭", writer_stats['written'])
+    col2.metric("기록 대기 중", writer_stats['pending'])
+    col3.metric("버려진 클릭", writer_stats['dropped'] + writer_stats['failed'])
+
+    # 가게 카탈로그 메모리 사용량 (기존 DataFrame 표현과 비교, 데이터 버전마다 한 번 계산)
+    memory_report = get_data_cache().get('catalog_memory', stats_version, store_catalog.memory_report)
+    total = memory_report.loc['합계']
+    with st.expander(f"🧠 가게 카탈로그 메모리: {total['압축'] / 1024:.1f} KB (기존 {total['기존'] / 1024:.1f} KB, {total['절감률']:.0%} 절감)"):
+        st.dataframe(memory_report, use_container_width=True)
 
     # --- 사용자 피드백 관리 섹션 ---
     st.markdown("---")
     st.header("💬 사용자 피드백 관리")
     try:
-        # ✅ 수정: 안정화된 유틸리티 함수 호출
-        feedback_df = load_feedback_data_stable()
-        
-        # 'rating' 컬럼은 이미 유틸리티 함수 내에서 to_numeric 처리됨
-        avg_ratings = feedback_df.groupby('store_name')['rating'].agg(['mean', 'count']).rename(columns={'mean': '평균별점', 'count': '리뷰수'}).round(2).sort_values('평균별점', ascending=False)
+        feedback_index = get_feedback_index()
+        feedback_df = feedback_index.latest()
+        
+        # 가게별 평균 별점은 미리 집계된 store_stats에서 계산 (전체 리뷰 재집계 불필요)
+        store_stats = get_event_store().read_store_stats()
+        store_stats = store_stats[store_stats['rating_count'] > 0]
+        avg_ratings = pd.DataFrame({
+            '평균별점': (store_stats['rating_sum'] / store_stats['rating_count']).round(2).to_numpy(),
+            '리뷰수': store_stats['rating_count'].to_numpy(),
+        }, index=pd.Index(store_stats['store_name'], name='store_name')).sort_values('평균별점', ascending=False)
         st.subheader("⭐ 최고/최저 평점 가게 Top 5")
         col1, col2 = st.columns(2)
         with col1: st.write("최고 평점 Top 5"); st.bar_chart(avg_ratings['평균별점'].head(5), color="#027529")
@@ -796,18 +967,20 @@ def render_admin_dashboard():
         with st.expander("전체 가게 평균 별점 보기"): st.dataframe(avg_ratings, use_container_width=True)
 
         st.subheader("리뷰 필터링 및 확인")
-        filter_store = st.selectbox("가게를 선택하여 리뷰를 필터링하세요.", options=['전체 보기'] + sorted(feedback_df['store_name'].unique()))
+        filter_store = st.selectbox("가게를 선택하여 리뷰를 필터링하세요.", options=['전체 보기'] + feedback_index.store_names())
         
         display_df = feedback_df
         if filter_store != '전체 보기':
-            display_df = feedback_df[feedback_df['store_name'] == filter_store]
-        st.dataframe(display_df.sort_values('timestamp', ascending=False), use_container_width=True)
+            display_df = feedback_index.reviews_for(filter_store)
+        st.dataframe(display_df, use_container_width=True)
         
         # 관리자 페이지에도 전체 리뷰 워드 클라우드 추가
         st.markdown("---")
         st.header("전체 리뷰 키워드 분석")
-        reviews_for_wc_all = feedback_df['review']
-        generate_word_cloud(reviews_for_wc_all, title="전체 리뷰 기반 키워드 분석")
+        top_keywords = get_synced_keyword_index().top_keywords(None, 10)
+        if top_keywords:
+            st.markdown("**전체 주요 키워드:** " + ", ".join(f"{word}({count})" for word, count in top_keywords))
+        generate_word_cloud(title="전체 리뷰 기반 키워드 분석")
         
     except FileNotFoundError:
         st.warning("아직 수집된 피드백 데이터가 없습니다.")
@@ -825,8 +998,23 @@ page_routes = {
     'admin_dashboard': render_admin_dashboard
 }
 
+def render_profile_report():
+    """프로파일 모드일 때 사이드바에 import/첫 렌더링 시간과 시작 시간 예산 초과 여부를 표시"""
+    if not profiler.ENABLED:
+        return
+    with st.sidebar.expander("⏱️ 시작 시간 프로파일"):
+        total = profiler.total_seconds()
+        if profiler.over_budget():
+            st.warning(f"시작 시간 예산 초과: {total:.2f}초 / {profiler.BUDGET_SECONDS:.2f}초")
+        else:
+            st.success(f"시작 시간: {total:.2f}초 / 예산 {profiler.BUDGET_SECONDS:.2f}초")
+        report = pd.DataFrame(profiler.records, columns=['종류', '이름', '초'])
+        st.dataframe(report.sort_values('초', ascending=False), use_container_width=True)
+
 page_function = page_routes.get(st.session_state.page)
 if page_function:
-    page_function()
+    with profiler.measure_first('render', st.session_state.page):
+        page_function()
+    render_profile_report()
 else:
     st.session_state.page = 'home'; st.rerun()
\ No newline at end of file
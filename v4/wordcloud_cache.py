@@ -0,0 +1,128 @@
+# 워드 클라우드 이미지 생성 및 디스크 캐시 (재시작 후에도 유지, 용량 초과 시 오래 안 쓴 이미지부터 삭제)
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+
+
+# 기록 도중 프로세스가 죽어 남은 임시 파일은 이 시간(초)이 지나면 정리 (다른 프로세스가 쓰는 중인 파일은 건드리지 않음)
+STALE_TMP_SECONDS = 3600
+
+# 이미지 생성 방식(입력, 크기, 색상 등)을 바꾸면 올려서 디스크에 남은 이전 이미지를 재사용하지 않도록 함
+RENDER_VERSION = 2
+
+
+def render_word_cloud_png(frequencies, title, font_path=None):
+    """미리 집계된 {단어: 빈도}로 워드 클라우드 PNG 이미지(bytes)를 만드는 함수 (Streamlit 호출 없음)"""
+    # 무거운 라이브러리는 실제로 이미지를 만들 때만 import
+    from wordcloud import WordCloud
+    from matplotlib.figure import Figure
+    from matplotlib import font_manager
+
+    wc = WordCloud(
+        font_path=font_path,
+        width=800,
+        height=400,
+        background_color='white',
+        max_words=100,
+        min_font_size=10,
+        colormap='summer'
+    ).generate_from_frequencies(frequencies)
+
+    # pyplot 전역 상태를 쓰지 않는 Figure 객체를 사용하여 여러 세션에서 동시에 그려도 안전하게 함
+    fig = Figure(figsize=(6, 3))
+    ax = fig.subplots()
+    ax.imshow(wc, interpolation='bilinear')
+    ax.axis('off')
+    if font_path is not None:
+        try:
+            ax.set_title(title, fontsize=16, fontproperties=font_manager.FontProperties(fname=font_path))
+        except Exception:
+            ax.set_title(title, fontsize=16)
+    else:
+        ax.set_title(title, fontsize=16)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight')
+    return buffer.getvalue()
+
+
+class DiskLRUCache:
+    """키별 바이너리(PNG)를 디렉터리에 저장하는 캐시 - 총 용량이 max_bytes를 넘으면 가장 오래 사용하지 않은 파일부터 삭제"""
+
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024, suffix='.png'):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + self.suffix)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        # 사용 시각을 갱신하여 LRU 순서에 반영
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        finally:
+            # 기록이나 교체가 실패하면 임시 파일을 남기지 않음 (교체에 성공했으면 이미 없음)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._evict()
+
+    def get_or_create(self, key, builder):
+        """캐시에 있으면 그대로 반환하고, 없으면 builder()로 만들어 저장 후 반환"""
+        data = self.get(key)
+        if data is None:
+            data = builder()
+            if data is not None:
+                self.put(key, data)
+        return data
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            stale_before = time.time() - STALE_TMP_SECONDS
+            for entry in os.scandir(self.directory):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.endswith(self.suffix):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                elif entry.name.endswith('.tmp') and stat.st_mtime < stale_before:
+                    # 강제 종료 등으로 교체되지 못한 임시 파일
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except FileNotFoundError:
+                    pass